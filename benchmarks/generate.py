@@ -0,0 +1,83 @@
+"""Synthetic INI generator for EasyINI benchmarks.
+
+    python benchmarks/generate.py out.ini --sections 300 --keys 20 --value-length 16 --fields 200
+"""
+import argparse
+import json
+import random
+import string
+
+
+def section_name(index):
+    return f"SECTION_{index:05d}"
+
+
+def key_name(index):
+    return f"key_{index:04d}"
+
+
+def generate_ini(path, sections=100, keys_per_section=10, value_length=16, seed=0):
+    """Write a synthetic INI file and return its size in bytes"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    lines = ["; Synthetic EasyINI benchmark file\n"]
+    for s in range(sections):
+        lines.append(f"\n[{section_name(s)}]\n")
+        for k in range(keys_per_section):
+            value = "".join(rng.choice(alphabet) for _ in range(value_length))
+            lines.append(f"{key_name(k)} = {value}\n")
+    data = "".join(lines).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def generate_fields(sections=100, keys_per_section=10, count=50):
+    """Return ``count`` field configs spread evenly over the generated keys.
+
+    Every other field gets a small CSV domain so both the dropdown and the
+    textbox editor rows are exercised.
+    """
+    total = sections * keys_per_section
+    count = min(count, total)
+    step = max(1, total // max(count, 1))
+    fields = []
+    for n in range(count):
+        index = n * step
+        section = section_name(index // keys_per_section)
+        option = key_name(index % keys_per_section)
+        fields.append({
+            "section": section,
+            "option": option,
+            "domain": "ALPHA, BETA, GAMMA" if n % 2 else "",
+            "display": f"{section}.{option}"
+        })
+    return fields
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="INI file to write")
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=10, help="keys per section")
+    parser.add_argument("--value-length", type=int, default=16)
+    parser.add_argument("--fields", type=int, default=50, help="configured field count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", help="also write an editor_config.json for the file here")
+    args = parser.parse_args(argv)
+
+    size = generate_ini(args.path, args.sections, args.keys, args.value_length, args.seed)
+    print(f"Wrote {args.path} ({size} bytes)")
+    if args.config:
+        config = {"files": [{
+            "name": "benchmark.ini",
+            "path": args.path,
+            "fields": generate_fields(args.sections, args.keys, args.fields)
+        }]}
+        with open(args.config, "w") as f:
+            json.dump(config, f, indent=2)
+        print(f"Wrote {args.config}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Reproducible EasyINI benchmarks on synthetic INI files.
+
+    python benchmarks/run.py --sections 300 --keys 20 --fields 200 --output results.json
+
+Times parsing, preview rendering, editor construction, keystroke-to-disk
+latency and save_changes. GUI benchmarks need a display; without one the
+runner starts a virtual X server (pyvirtualdisplay if installed, else an
+Xvfb binary). Results are written as JSON so runs of different versions
+can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import easyini  # noqa: E402
+from generate import generate_fields, generate_ini  # noqa: E402
+
+
+def summarize(samples):
+    return {
+        "samples": len(samples),
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "max_ms": max(samples)
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_core(ini_path, fields, repeat):
+    """Benchmarks of the headless engine (no display needed)"""
+    with open(ini_path, "rb") as f:
+        data = f.read()
+    results = {"parse_ini": [], "parse_cache_cold": [], "parse_cache_warm": [], "patch_commit": []}
+    cache = easyini.ParseCache(1024 * 1024 * 1024)
+    field = fields[0]
+    for i in range(repeat):
+        results["parse_ini"].append(timed(easyini.parse_ini, data, ini_path))
+        cache.invalidate(ini_path)
+        results["parse_cache_cold"].append(timed(cache.get, ini_path))
+        results["parse_cache_warm"].append(timed(cache.get, ini_path))
+
+        document, _config = cache.get(ini_path)
+
+        def _edit_and_commit():
+            document.set(field["section"], field["option"], f"core-{i}")
+            error = easyini.commit_patches({ini_path: [document.prepare_write()]}, cache.revalidate)
+            if error is not None:
+                raise error
+        results["patch_commit"].append(timed(_edit_and_commit))
+    return results
+
+
+def start_virtual_display():
+    """Return a handle to stop a virtual display, or None when one is not needed"""
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    try:
+        from pyvirtualdisplay import Display
+    except ImportError:
+        Display = None
+    if Display is not None:
+        display = Display(visible=False, size=(1280, 900))
+        display.start()
+        return display.stop
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("no display available; install Xvfb or pyvirtualdisplay")
+    proc = subprocess.Popen([xvfb, ":97", "-screen", "0", "1280x900x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = ":97"
+    time.sleep(0.5)
+    return proc.terminate
+
+
+def bench_gui(ini_path, fields, repeat, delay_ms, workdir):
+    """Benchmarks of the Tk editor, run against a throwaway AppData directory"""
+    os.environ["APPDATA"] = workdir
+    file_config = {"name": "benchmark.ini", "path": ini_path, "fields": fields}
+    easyini.save_config({"files": [file_config], "autosave_delay_ms": delay_ms})
+
+    import tkinter as tk
+    import main as gui
+
+    # Dialogs would block the run; record them instead
+    dialogs = []
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(gui.messagebox, name, lambda *args, _name=name, **kwargs: dialogs.append((_name, args)))
+
+    root = tk.Tk()
+    root.geometry("1200x800")
+    editor = gui.Editor(root)
+    editor.build_page(editor.editor_frame)
+    editor.notebook.select(editor.editor_frame)
+    root.update()
+    file_config = editor.config_data["files"][0]
+    text_field = next((f for f in fields if not f["domain"]), fields[0])
+
+    results = {
+        "parse (load_ini_file)": [],
+        "load_ini_file": [],
+        "update_preview_display": [],
+        "create_editor_fields": [],
+        "keystroke_handler": [],
+        "keystroke_to_disk": [],
+        "save_changes": []
+    }
+
+    def _settle():
+        # Loads and saves finish on the I/O pool and report back through root.after,
+        # so the event loop has to run until nothing is in flight
+        while editor._load_task is not None or editor.io.busy() or editor.save_scheduler.pending():
+            root.update()
+            time.sleep(0.001)
+        root.update_idletasks()
+
+    def _load():
+        editor.load_ini_file(file_config)
+        _settle()
+        if editor.current_document is None:
+            raise RuntimeError("load_ini_file did not load the file")
+
+    def _save():
+        editor.save_changes()
+        _settle()
+
+    def _render():
+        editor.update_preview_display(rebuild=True)
+        root.update_idletasks()
+
+    def _build():
+        editor.create_editor_fields(file_config)
+        root.update_idletasks()
+
+    for i in range(repeat):
+        editor.parse_cache.invalidate(ini_path)
+        results["parse (load_ini_file)"].append(timed(editor.parse_cache.get, ini_path))
+        editor.parse_cache.invalidate(ini_path)
+        results["load_ini_file"].append(timed(_load))
+        results["update_preview_display"].append(timed(_render))
+        results["create_editor_fields"].append(timed(_build))
+
+        value = f"typed-{i}"
+        var = tk.StringVar(value=value)
+        start = time.perf_counter()
+        editor.update_live_preview(var, text_field["section"], text_field["option"])
+        results["keystroke_handler"].append((time.perf_counter() - start) * 1000)
+        while editor.save_scheduler.pending():
+            root.update()
+            time.sleep(0.001)
+        results["keystroke_to_disk"].append((time.perf_counter() - start) * 1000)
+        with open(ini_path, "rb") as f:
+            on_disk = easyini.IniDocument(f.read()).get(text_field["section"], text_field["option"])
+        if on_disk != value:
+            raise RuntimeError(f"keystroke did not reach the disk: {on_disk!r} != {value!r}")
+
+        if len(editor.editor_fields):
+            editor.editor_fields.values[0] = f"saved-{i}"
+        results["save_changes"].append(timed(_save))
+
+    editor.on_close()
+    errors = [args for name, args in dialogs if name != "showinfo"]
+    if errors:
+        raise RuntimeError(f"editor reported errors: {errors}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=10, help="keys per section")
+    parser.add_argument("--value-length", type=int, default=16)
+    parser.add_argument("--fields", type=int, default=50, help="configured field count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--autosave-delay-ms", type=int, default=400)
+    parser.add_argument("--no-gui", action="store_true", help="only run the headless benchmarks")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="easyini-bench-")
+    ini_path = os.path.join(workdir, "benchmark.ini")
+    size = generate_ini(ini_path, args.sections, args.keys, args.value_length, args.seed)
+    fields = generate_fields(args.sections, args.keys, args.fields)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "params": {
+            "sections": args.sections,
+            "keys_per_section": args.keys,
+            "value_length": args.value_length,
+            "configured_fields": len(fields),
+            "file_bytes": size,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "autosave_delay_ms": args.autosave_delay_ms
+        },
+        "results": {},
+        "skipped": {}
+    }
+
+    for name, samples in bench_core(ini_path, fields, args.repeat).items():
+        report["results"][f"core.{name}"] = summarize(samples)
+
+    if args.no_gui:
+        report["skipped"]["gui"] = "disabled with --no-gui"
+    else:
+        stop_display = None
+        try:
+            stop_display = start_virtual_display()
+            for name, samples in bench_gui(ini_path, fields, args.repeat, args.autosave_delay_ms, workdir).items():
+                report["results"][f"gui.{name}"] = summarize(samples)
+        except Exception as e:
+            report["skipped"]["gui"] = str(e)
+        finally:
+            if stop_display is not None:
+                stop_display()
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
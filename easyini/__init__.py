@@ -0,0 +1,155 @@
+"""EasyINI core: INI parsing, the field registry and saving, without tkinter.
+
+Typical headless use::
+
+    import easyini
+
+    station = easyini.open_file("station.ini")
+    print(station.values())
+    station.set("DECODE", "CALIBRATION", "1.25")
+    station.save()
+
+``open_file`` reads the same editor_config.json the GUI uses. ``IniFile``
+can also be opened directly from a path. Saves go through ``IniDocument``,
+so comments and formatting survive, and are written atomically.
+
+To push values to many files at once, use ``bulk_apply`` or the command
+line::
+
+    python -m easyini apply --all --set DECODE MODE FAST --dry-run
+
+Scripts that change settings often can talk to a long-running
+``python -m easyini serve`` through ``DaemonClient`` instead, which saves
+starting Python and parsing the files for every edit.
+"""
+import importlib
+
+# Public name -> submodule defining it. Submodules are imported on first
+# use, so importing easyini (or one class from it) does not load the
+# daemon, bulk apply, snapshot or search code unless they are used.
+_EXPORTS = {
+    "BackgroundIO": "background",
+    "DaemonClient": "daemon",
+    "EasyIniDaemon": "daemon",
+    "EditHistory": "history",
+    "EditJournal": "journal",
+    "FieldSchema": "schema",
+    "FieldSpec": "records",
+    "FieldTable": "records",
+    "FileChangedError": "document",
+    "FileLocking": "locking",
+    "FileSpec": "records",
+    "FileWatcher": "watcher",
+    "GroupCommitWriter": "storage",
+    "IniDocument": "document",
+    "IniFile": "inifile",
+    "IniPatch": "document",
+    "IoTask": "background",
+    "LazyIniView": "lazy",
+    "LockTimeout": "locking",
+    "ParseCache": "cache",
+    "Prefetcher": "prefetch",
+    "SearchIndex": "search",
+    "SnapshotStore": "snapshot",
+    "apply_to_file": "bulk",
+    "build_view_model": "prefetch",
+    "bulk_apply": "bulk",
+    "collect_values": "discovery",
+    "commit_patches": "storage",
+    "compile_domain": "schema",
+    "compile_field": "schema",
+    "daemon_info_path": "daemon",
+    "describe_suggestion": "discovery",
+    "domain_values": "registry",
+    "find_file": "registry",
+    "infer_field": "discovery",
+    "is_sharing_violation": "background",
+    "journal_dir": "journal",
+    "journal_path": "journal",
+    "load_config": "registry",
+    "lock_path": "locking",
+    "metrics": "instrumentation",
+    "open_file": "inifile",
+    "orphaned_journals": "journal",
+    "parse_ini": "document",
+    "parse_lazy": "lazy",
+    "replay_pending": "journal",
+    "resource_path": "registry",
+    "retry_io": "background",
+    "save_config": "registry",
+    "snapshot_dir": "snapshot",
+    "stage_file": "storage",
+    "sync_directory": "storage",
+    "user_config_path": "registry",
+    "write_atomic": "storage",
+}
+
+__all__ = [
+    "BackgroundIO",
+    "DaemonClient",
+    "EasyIniDaemon",
+    "EditHistory",
+    "EditJournal",
+    "FieldSchema",
+    "FieldSpec",
+    "FieldTable",
+    "FileChangedError",
+    "FileLocking",
+    "FileSpec",
+    "FileWatcher",
+    "GroupCommitWriter",
+    "IniDocument",
+    "IniFile",
+    "IniPatch",
+    "IoTask",
+    "LazyIniView",
+    "LockTimeout",
+    "ParseCache",
+    "Prefetcher",
+    "SearchIndex",
+    "SnapshotStore",
+    "apply_to_file",
+    "build_view_model",
+    "bulk_apply",
+    "collect_values",
+    "commit_patches",
+    "compile_domain",
+    "compile_field",
+    "daemon_info_path",
+    "describe_suggestion",
+    "domain_values",
+    "find_file",
+    "infer_field",
+    "is_sharing_violation",
+    "journal_dir",
+    "journal_path",
+    "load_config",
+    "lock_path",
+    "metrics",
+    "open_file",
+    "orphaned_journals",
+    "parse_ini",
+    "parse_lazy",
+    "replay_pending",
+    "resource_path",
+    "retry_io",
+    "save_config",
+    "snapshot_dir",
+    "stage_file",
+    "sync_directory",
+    "user_config_path",
+    "write_atomic",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,85 @@
+"""Slow file operations on worker threads, with retries for files held by other programs."""
+import errno
+import threading
+import time
+
+# Windows ERROR_SHARING_VIOLATION and ERROR_LOCK_VIOLATION
+WINDOWS_SHARING_ERRORS = (32, 33)
+
+
+def is_sharing_violation(error):
+    """Return True when ``error`` means another program (a sync client, a virus
+    scanner) briefly holds the file, so the same call may succeed shortly"""
+    if not isinstance(error, OSError):
+        return False
+    if getattr(error, "winerror", None) in WINDOWS_SHARING_ERRORS:
+        return True
+    return error.errno in (errno.EACCES, errno.EBUSY)
+
+
+def retry_io(func, *args, attempts=5, delay=0.05, max_delay=1.0):
+    """Call ``func(*args)``, retrying sharing violations with exponential backoff"""
+    for attempt in range(attempts):
+        try:
+            return func(*args)
+        except OSError as e:
+            if attempt == attempts - 1 or not is_sharing_violation(e):
+                raise
+        time.sleep(min(delay * 2 ** attempt, max_delay))
+
+
+class IoTask:
+    """Handle for one operation submitted to BackgroundIO"""
+
+    def __init__(self, future, timeout, label):
+        self.future = future
+        self.label = label
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancelled = False
+
+    def done(self):
+        return self.future.done()
+
+    def expired(self, now=None):
+        """Return True once the task has run longer than its timeout"""
+        return self.deadline is not None and (now or time.monotonic()) >= self.deadline
+
+    def cancel(self):
+        """Stop caring about the result; a call already running still finishes"""
+        self.cancelled = True
+        self.future.cancel()
+
+
+class BackgroundIO:
+    """Thread pool for file reads and writes that must not block the GUI.
+
+    Submitted calls are retried on sharing violations (see ``retry_io``).
+    Python cannot interrupt a thread stuck in a system call, so a timeout
+    only tells the caller to give up waiting: the task is marked expired and
+    its eventual result should be ignored.
+    """
+
+    def __init__(self, workers=2, attempts=5, backoff_ms=50, timeout_s=30):
+        self.workers = workers
+        self.attempts = attempts
+        self.backoff = backoff_ms / 1000
+        self.timeout = timeout_s
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, timeout=None, label=None):
+        """Run ``func(*args)`` on a worker and return its IoTask"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="EasyINI-io")
+            future = self._executor.submit(retry_io, func, *args, attempts=self.attempts, delay=self.backoff)
+        return IoTask(future, self.timeout if timeout is None else timeout, label or getattr(func, "__name__", "I/O"))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,100 @@
+"""Apply field assignments to many configured INI files in parallel."""
+import difflib
+import os
+
+from .document import parse_ini
+from .locking import default_locking
+from .schema import compile_field
+from .storage import commit_patches
+
+
+def validate_assignment(file_config, section, option, value, allow_unconfigured=False):
+    """Return an error message if ``value`` is not allowed for the field, else None"""
+    for field in file_config.get("fields", []):
+        if field["section"] == section and field["option"] == option:
+            error = compile_field(field).validate(value)
+            if error is not None:
+                return f"{section}.{option}: {error}"
+            return None
+    if allow_unconfigured:
+        return None
+    return f"{section}.{option} is not a configured field"
+
+
+def apply_to_file(file_config, assignments, dry_run=False, allow_unconfigured=False):
+    """Validate and apply ``assignments`` to one file; return a result dict.
+
+    Runs in a worker process or thread, so it only takes and returns plain
+    data. The file is written atomically unless ``dry_run`` is set; the
+    result carries a unified diff of the change either way.
+    """
+    result = {
+        "name": file_config.get("name", file_config["path"]),
+        "path": file_config["path"],
+        "ok": False,
+        "changed": [],
+        "diff": "",
+        "error": None
+    }
+    errors = [
+        error for error in (
+            validate_assignment(file_config, section, option, value, allow_unconfigured)
+            for section, option, value in assignments
+        ) if error
+    ]
+    if errors:
+        result["error"] = "; ".join(errors)
+        return result
+
+    try:
+        path = file_config["path"]
+        with default_locking.hold(path, shared=True), open(path, 'rb') as f:
+            data = f.read()
+        document, _config = parse_ini(data, source=path)
+        before = document.text()
+        for section, option, value in assignments:
+            old = document.get(section, option)
+            if old != value:
+                document.set(section, option, value)
+                result["changed"].append((section, option, old, value))
+        if result["changed"]:
+            result["diff"] = "".join(difflib.unified_diff(
+                before.splitlines(keepends=True),
+                document.text().splitlines(keepends=True),
+                fromfile=path,
+                tofile=path
+            ))
+            if not dry_run:
+                error = commit_patches({path: [document.prepare_write()]})
+                if error is not None:
+                    raise error
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def bulk_apply(file_configs, assignments, dry_run=False, allow_unconfigured=False,
+               jobs=None, use_threads=False):
+    """Apply ``assignments`` to every file in ``file_configs`` using a worker pool.
+
+    Returns the per-file result dicts in the order of ``file_configs``.
+    Processes are used by default so parsing scales with cores; threads are
+    cheaper to start for a handful of small files.
+    """
+    file_configs = list(file_configs)
+    if not file_configs:
+        return []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(file_configs)))
+    if jobs == 1:
+        return [apply_to_file(f, assignments, dry_run, allow_unconfigured) for f in file_configs]
+    # Imported here so `import easyini` stays fast for callers that never bulk-apply
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(apply_to_file, f, assignments, dry_run, allow_unconfigured)
+            for f in file_configs
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,187 @@
+"""Shared, validated LRU cache of parsed INI files."""
+import os
+import threading
+from collections import OrderedDict
+
+from .document import CopyOnWriteConfig, config_from_values, config_values, parse_ini
+from .instrumentation import metrics
+from .lazy import DeferredDocument, LazyIniView, parse_lazy
+from .locking import default_locking
+
+
+class ParseCache:
+    """Shared LRU cache of parsed INI files.
+
+    Entries are validated against (path, st_mtime_ns, st_size) on every
+    lookup, so a file changed on disk is parsed again. The cache is bounded
+    by an approximate memory budget and keeps hit/miss counters.
+
+    The cache keeps an unmodified IniDocument and ConfigParser per file and
+    hands out copy-on-write copies of them (``IniDocument.copy`` and
+    CopyOnWriteConfig): a lookup that only reads shares the cached objects,
+    and the first edit gives the caller its own, so one caller's unsaved
+    edits are never served to another. Callers that will edit can
+    ``preload`` the copies on a worker thread.
+
+    ``mode`` is "eager", "lazy" or "auto"; in auto mode files larger than
+    ``lazy_threshold`` bytes get a LazyIniView instead of a ConfigParser.
+    With a SnapshotStore, eagerly parsed files are restored from (and saved
+    to) their on-disk snapshots, so an unchanged file is parsed only once.
+    Files are read under a shared advisory lock from ``locking``.
+    """
+
+    # Lazy entries only hold the section index until sections are opened
+    LAZY_COST_FACTOR = 1
+    # A parsed document and ConfigParser take about 20 times the file's size, so the
+    # default budget still fits a file just below the default lazy threshold
+    EAGER_COST_FACTOR = 20
+
+    MODES = ("eager", "lazy", "auto")
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, mode="auto", lazy_threshold=4 * 1024 * 1024, snapshots=None,
+                 locking=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown parse mode {mode!r}; expected one of {', '.join(self.MODES)}")
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.lazy_threshold = lazy_threshold
+        self.snapshots = snapshots
+        self.locking = locking or default_locking
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # path -> (stat key, parsed, cost)
+        self._written = {}             # path -> stat key of our own last write
+        self._size = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _normalize(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def _stat_key(st):
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path):
+        """Return copy-on-write (IniDocument, ConfigParser) copies for ``path``, parsing only on a miss"""
+        document, config, _key = self.load(path)
+        return document, config
+
+    def load(self, path):
+        """Like ``get``, also returning the (st_mtime_ns, st_size) key the data was read with"""
+        name = self._normalize(path)
+        st = os.stat(path)
+        key = self._stat_key(st)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                parsed = entry[1]
+            else:
+                self.misses += 1
+                parsed = None
+        if parsed is not None:
+            return self._checkout(path, parsed) + (key,)
+
+        if self.mode == "lazy" or (self.mode == "auto" and st.st_size > self.lazy_threshold):
+            with metrics.timer("parse"), self.locking.hold(path, shared=True):
+                document, view, key = parse_lazy(path)
+            # The cached view stays unmaterialized; callers get copies sharing its index
+            self._store(name, key, view, key[1] * self.LAZY_COST_FACTOR)
+            return document, view.copy(), key
+
+        # Only the read itself is locked; parsing works on the bytes
+        with self.locking.hold(path, shared=True), open(path, 'rb') as f:
+            data = f.read()
+            key = self._stat_key(os.fstat(f.fileno()))
+        with metrics.timer("parse"):
+            document, config = self._parse(data, path, key[0])
+        # Freshly parsed objects become the cached ones; the caller gets copies
+        self._store(name, key, (document, config), len(data) * self.EAGER_COST_FACTOR)
+        return self._checkout(path, (document, config)) + (key,)
+
+    def _parse(self, data, path, mtime_ns):
+        if self.snapshots is None:
+            return parse_ini(data, source=path)
+        digest = self.snapshots.digest(data)
+        parsed = self.snapshots.load(data, mtime_ns, digest)
+        if parsed is None:
+            parsed = parse_ini(data, source=path)
+            self.snapshots.save(data, *parsed, mtime_ns, digest=digest)
+        return parsed
+
+    def _checkout(self, path, parsed):
+        if isinstance(parsed, LazyIniView):
+            return DeferredDocument(path), parsed.copy()
+        document, config = parsed
+        return document.copy(), CopyOnWriteConfig(config, source=path)
+
+    def put(self, path, document, config, key=None):
+        """Cache the parse result of unmodified ``document`` and ``config`` for ``path``.
+
+        The caller keeps its objects; the cache stores copies of them.
+        ``key`` defaults to the file's current stat.
+        """
+        if key is None:
+            key = self._stat_key(os.stat(path))
+        if getattr(config, "lazy", False):
+            self._store(self._normalize(path), key, config.copy(), key[1] * self.LAZY_COST_FACTOR)
+            return
+        parsed = (document.copy(), config_from_values(*config_values(config), source=path))
+        self._store(self._normalize(path), key, parsed, key[1] * self.EAGER_COST_FACTOR)
+
+    def _store(self, name, key, parsed, cost):
+        with self._lock:
+            self._discard(name)
+            if cost > self.max_bytes:
+                return
+            self._entries[name] = (key, parsed, cost)
+            self._size += cost
+            while self._size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def revalidate(self, path):
+        """Note that this process just wrote ``path``.
+
+        The cached parse result no longer matches the file and is dropped;
+        the new stat key is remembered so ``is_fresh`` recognizes our write.
+        """
+        name = self._normalize(path)
+        with self._lock:
+            self._discard(name)
+            try:
+                self._written[name] = self._stat_key(os.stat(path))
+            except OSError:
+                self._written.pop(name, None)
+
+    def is_fresh(self, path):
+        """Return True when the file still matches the cached entry or our own last write"""
+        name = self._normalize(path)
+        try:
+            key = self._stat_key(os.stat(path))
+        except OSError:
+            return False
+        with self._lock:
+            entry = self._entries.get(name)
+            return (entry is not None and entry[0] == key) or self._written.get(name) == key
+
+    def invalidate(self, path):
+        """Drop the cached entry for ``path``"""
+        with self._lock:
+            self._discard(self._normalize(path))
+
+    def stats(self):
+        """Return hit/miss counters and current usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size
+            }
+
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._size -= entry[2]
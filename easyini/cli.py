@@ -0,0 +1,112 @@
+"""Command-line interface: ``python -m easyini`` or ``EasyINI.exe apply ...``."""
+import argparse
+import sys
+
+from .bulk import bulk_apply
+from .registry import find_file, load_config
+
+COMMANDS = ("apply", "serve")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="easyini", description="Headless EasyINI tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    apply_parser = subparsers.add_parser(
+        "apply",
+        help="set field values in many configured INI files at once"
+    )
+    apply_parser.add_argument(
+        "--set", dest="assignments", action="append", nargs=3, required=True,
+        metavar=("SECTION", "OPTION", "VALUE"),
+        help="assignment to apply; may be repeated"
+    )
+    targets = apply_parser.add_mutually_exclusive_group(required=True)
+    targets.add_argument("--all", action="store_true", help="apply to every configured file")
+    targets.add_argument("--file", dest="files", action="append", metavar="NAME",
+                         help="configured file name; may be repeated")
+    apply_parser.add_argument("--config", help="path to editor_config.json (default: AppData)")
+    apply_parser.add_argument("--dry-run", action="store_true", help="show diffs without writing")
+    apply_parser.add_argument("--jobs", type=int, default=None, help="worker count (default: CPU count)")
+    apply_parser.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    apply_parser.add_argument("--allow-unconfigured", action="store_true",
+                              help="allow keys that are not configured fields")
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="keep configured files parsed and answer get/set requests over a local socket"
+    )
+    address = serve_parser.add_mutually_exclusive_group()
+    address.add_argument("--socket", help="Unix socket path (default: next to editor_config.json)")
+    address.add_argument("--port", type=int, help="listen on this localhost TCP port instead")
+    serve_parser.add_argument("--config", help="path to editor_config.json (default: AppData)")
+    serve_parser.add_argument("--allow-unconfigured", action="store_true",
+                              help="allow keys that are not configured fields")
+    return parser
+
+
+def run_apply(args, out=sys.stdout):
+    config_data = load_config(args.config)
+    if args.all:
+        file_configs = config_data.get("files", [])
+    else:
+        file_configs = []
+        for name in args.files:
+            file_config = find_file(config_data, name)
+            if file_config is None:
+                print(f"Unknown configured file: {name}", file=sys.stderr)
+                return 2
+            file_configs.append(file_config)
+
+    assignments = [tuple(a) for a in args.assignments]
+    results = bulk_apply(
+        file_configs,
+        assignments,
+        dry_run=args.dry_run,
+        allow_unconfigured=args.allow_unconfigured,
+        jobs=args.jobs,
+        use_threads=args.threads
+    )
+
+    if args.dry_run:
+        for result in results:
+            if result["diff"]:
+                out.write(result["diff"])
+
+    failed = 0
+    for result in results:
+        if result["ok"]:
+            verb = "would change" if args.dry_run else "changed"
+            out.write(f"OK    {result['name']}: {verb} {len(result['changed'])} value(s)\n")
+        else:
+            failed += 1
+            out.write(f"FAIL  {result['name']}: {result['error']}\n")
+    out.write(f"{len(results) - failed} succeeded, {failed} failed\n")
+    return 1 if failed else 0
+
+
+def run_serve(args, out=sys.stdout):
+    # Sockets and the server are only needed by this command
+    from .daemon import EasyIniDaemon
+
+    daemon = EasyIniDaemon(args.config, allow_unconfigured=args.allow_unconfigured)
+    address = ("127.0.0.1", args.port) if args.port is not None else args.socket
+    out.write("EasyINI daemon running; press Ctrl+C to stop\n")
+    out.flush()
+    try:
+        daemon.serve(address)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        sys.stderr.write(f"Cannot start the daemon: {e}\n")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "apply":
+        return run_apply(args)
+    if args.command == "serve":
+        return run_serve(args)
+    return 2
@@ -0,0 +1,330 @@
+"""Long-running server that keeps configured files parsed for scripts.
+
+``python -m easyini serve`` listens on a Unix domain socket (or a
+localhost TCP port where those are unavailable) and answers batches of
+get/set operations on configured fields. Requests and responses are one
+JSON object per line, and a connection may carry any number of them::
+
+    {"token": "...", "ops": [
+        {"op": "get", "file": "station", "section": "DECODE", "option": "MODE"},
+        {"op": "set", "file": "station", "section": "DECODE", "option": "GAIN", "value": "12"}
+    ]}
+    {"ok": true, "results": [{"ok": true, "value": "FAST"}, {"ok": true, "changed": true}]}
+
+A get without section and option returns every configured field of the
+file. Sets are validated against the fields' domains and schemas first;
+if any is rejected, none of the batch's sets are written. The address and
+the token clients must send are published in daemon.json next to the
+user's editor_config.json, readable only by its owner.
+"""
+import hmac
+import json
+import logging
+import os
+import secrets
+import socket
+import socketserver
+import threading
+
+from .bulk import validate_assignment
+from .cache import ParseCache
+from .locking import default_locking
+from .registry import load_config, user_config_path
+from .storage import commit_patches, write_atomic
+
+logger = logging.getLogger("easyini")
+
+
+def daemon_info_path():
+    """Return where a running daemon publishes its address and token"""
+    return os.path.join(os.path.dirname(user_config_path()), 'daemon.json')
+
+
+def default_address():
+    """Return a Unix socket path next to the user config, or a free localhost port"""
+    if hasattr(socket, "AF_UNIX") and os.name == 'posix':
+        return os.path.join(os.path.dirname(user_config_path()), 'daemon.sock')
+    return ("127.0.0.1", 0)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.daemon.handle(json.loads(line))
+            except ValueError as e:
+                response = {"ok": False, "error": f"Malformed request: {e}"}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class EasyIniDaemon:
+    """Serve get/set batches for the files in editor_config.json.
+
+    Each file's IniDocument is kept for as long as the daemon runs and is
+    only read again (through ``cache``) when its (st_mtime_ns, st_size)
+    changes on disk; sets patch it in place and re-key it after the write,
+    so a get after a set does not parse. editor_config.json is re-read when
+    it changes. Writes use ``commit_patches`` like the editor's autosave, so
+    they are atomic, keep formatting and take the same advisory lock.
+    Batches are handled one at a time.
+    """
+
+    def __init__(self, config_path=None, cache=None, locking=None, allow_unconfigured=False):
+        self.config_path = config_path or user_config_path()
+        self.cache = cache or ParseCache()
+        self.locking = locking or default_locking
+        self.allow_unconfigured = allow_unconfigured
+        self.token = secrets.token_hex(16)
+        self.server = None
+        self._lock = threading.Lock()
+        self._files = {}
+        self._config_key = None
+        self._documents = {}  # normalized path -> (stat key, IniDocument)
+
+    def files(self):
+        """Return {name: file config}, re-reading editor_config.json if it changed"""
+        try:
+            st = os.stat(self.config_path)
+            key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key is None or key != self._config_key:
+            config_data = load_config(self.config_path)
+            self._files = {f["name"]: f for f in config_data.get("files", [])}
+            self._config_key = key
+        return self._files
+
+    def warm(self):
+        """Parse every configured file now so the first requests are fast"""
+        for file_config in self.files().values():
+            try:
+                self._document(file_config["path"])
+            except Exception as e:
+                logger.warning("Could not load %s: %s", file_config["path"], e)
+
+    def handle(self, request):
+        """Answer one request object; see the module docstring for the format"""
+        if not isinstance(request, dict) or not hmac.compare_digest(str(request.get("token", "")), self.token):
+            return {"ok": False, "error": "Missing or wrong token"}
+        ops = request.get("ops")
+        if not isinstance(ops, list):
+            return {"ok": False, "error": "Expected a list of ops"}
+        with self._lock:
+            return self._run(ops)
+
+    def _run(self, ops):
+        files = self.files()
+        results = [None] * len(ops)
+        sets = []      # (index, file config, section, option, value)
+        rejected = False
+        for index, op in enumerate(ops):
+            kind = op.get("op") if isinstance(op, dict) else None
+            try:
+                if kind is None:
+                    raise ValueError("Each op must be an object with an \"op\" key")
+                file_config = files.get(op.get("file"))
+                if file_config is None:
+                    raise ValueError(f"No configured file named {op.get('file')!r}")
+                if kind == "get":
+                    results[index] = self._get(file_config, op.get("section"), op.get("option"))
+                elif kind == "set":
+                    section, option, value = op["section"], op["option"], str(op["value"])
+                    error = validate_assignment(file_config, section, option, value, self.allow_unconfigured)
+                    if error is not None:
+                        raise ValueError(error)
+                    sets.append((index, file_config, section, option, value))
+                else:
+                    raise ValueError(f"Unknown op {kind!r}; expected get or set")
+            except Exception as e:
+                results[index] = {"ok": False, "error": str(e)}
+                rejected = rejected or kind == "set"
+
+        if rejected:
+            for index, *_rest in sets:
+                results[index] = {"ok": False, "error": "Not written: another set in the batch was rejected"}
+        elif sets:
+            self._write(sets, results)
+        return {"ok": all(result["ok"] for result in results), "results": results}
+
+    def _document(self, path):
+        """Return the kept IniDocument of ``path``, reading it again if it changed on disk"""
+        name = ParseCache._normalize(path)
+        entry = self._documents.get(name)
+        if entry is not None and entry[0] == ParseCache._stat_key(os.stat(path)):
+            return entry[1]
+        document, _config, key = self.cache.load(path)
+        # The daemon keeps its own copy; the cached one is not needed again
+        self.cache.invalidate(path)
+        self._documents[name] = (key, document)
+        return document
+
+    def _get(self, file_config, section, option):
+        document = self._document(file_config["path"])
+        if section is None and option is None:
+            return {"ok": True, "values": {
+                f"{field['section']}.{field['option']}": document.get(field["section"], field["option"])
+                for field in file_config.get("fields", [])
+            }}
+        if not self.allow_unconfigured and not any(
+                field["section"] == section and field["option"] == option
+                for field in file_config.get("fields", [])):
+            raise ValueError(f"{section}.{option} is not a configured field")
+        return {"ok": True, "value": document.get(section, option)}
+
+    def _write(self, sets, results):
+        by_path = {}
+        for index, file_config, section, option, value in sets:
+            by_path.setdefault(file_config["path"], []).append((index, section, option, value))
+        for path, entries in by_path.items():
+            name = ParseCache._normalize(path)
+            try:
+                document = self._document(path)
+                changed = {}
+                for index, section, option, value in entries:
+                    changed[index] = document.get(section, option) != value
+                    if changed[index]:
+                        document.set(section, option, value)
+                if any(changed.values()):
+                    patch = document.prepare_write()
+
+                    def written(path):
+                        # Our own write: the kept document already matches the file
+                        self._documents[name] = (ParseCache._stat_key(os.stat(path)), document)
+
+                    error = commit_patches({path: [patch]}, written, self.locking)
+                    if error is not None:
+                        # The document holds edits the file does not have
+                        del self._documents[name]
+                        raise error
+                for index, was_changed in changed.items():
+                    results[index] = {"ok": True, "changed": was_changed}
+            except Exception as e:
+                for index, *_rest in entries:
+                    results[index] = {"ok": False, "error": str(e)}
+
+    def serve(self, address=None, info_path=None):
+        """Listen on ``address`` (socket path or (host, port)) until ``shutdown``"""
+        address = address or default_address()
+        info_path = info_path or daemon_info_path()
+        if _answers(info_path):
+            raise OSError(f"An EasyINI daemon is already running (see {info_path})")
+        if isinstance(address, str):
+            if _UnixServer is None:
+                raise OSError("Unix domain sockets are not available here; use a port")
+            if os.path.exists(address):
+                if _accepts(address):
+                    raise OSError(f"Something is already listening on {address}")
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(address)
+            os.makedirs(os.path.dirname(os.path.abspath(address)), exist_ok=True)
+            self.server = _UnixServer(address, _Handler)
+            os.chmod(address, 0o600)
+            published = address
+        else:
+            self.server = _TCPServer(address, _Handler)
+            published = list(self.server.server_address[:2])
+        self.server.daemon = self
+
+        os.makedirs(os.path.dirname(info_path), exist_ok=True)
+        write_atomic(info_path, json.dumps({"address": published, "token": self.token, "pid": os.getpid()}).encode('utf-8'))
+        os.chmod(info_path, 0o600)
+        self.warm()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if isinstance(address, str) and os.path.exists(address):
+                os.unlink(address)
+            if os.path.exists(info_path):
+                os.unlink(info_path)
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def _answers(info_path):
+    """Return True when the daemon published in ``info_path`` still answers requests"""
+    try:
+        with DaemonClient(info_path, timeout=1) as client:
+            return client.call([]).get("ok", False)
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _accepts(address):
+    """Return True when a process accepts connections on the Unix socket ``address``"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1)
+    try:
+        probe.connect(address)
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+class DaemonClient:
+    """Connection to a running daemon, found through its daemon.json"""
+
+    def __init__(self, info_path=None, timeout=10):
+        with open(info_path or daemon_info_path()) as f:
+            info = json.load(f)
+        self.token = info["token"]
+        address = info["address"]
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(address)
+        else:
+            self._socket = socket.create_connection(tuple(address), timeout)
+        self._file = self._socket.makefile('rwb')
+
+    def call(self, ops):
+        """Send one batch of ops and return the response object"""
+        self._file.write(json.dumps({"token": self.token, "ops": ops}).encode('utf-8') + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The EasyINI daemon closed the connection")
+        return json.loads(line)
+
+    def get(self, file, section, option):
+        """Return one field's value (None when the key is missing)"""
+        result = self.call([{"op": "get", "file": file, "section": section, "option": option}])["results"][0]
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return result["value"]
+
+    def set(self, file, section, option, value):
+        """Validate and write one field; return True when the file changed"""
+        result = self.call([{"op": "set", "file": file, "section": section, "option": option, "value": value}])["results"][0]
+        if not result["ok"]:
+            raise ValueError(result["error"])
+        return result["changed"]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
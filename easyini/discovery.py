@@ -0,0 +1,83 @@
+"""Suggest field definitions from the keys found in a parsed INI file."""
+import math
+
+BOOLEAN_PAIRS = (("true", "false"), ("yes", "no"), ("on", "off"))
+
+# More distinct values than this is treated as free text
+MAX_ENUM_VALUES = 8
+
+
+def collect_values(config):
+    """Return {(section, option): [value, ...]} for the keys each section of ``config`` sets.
+
+    Keys a section only inherits unchanged from DEFAULT are left out.
+    """
+    defaults = dict(config["DEFAULT"].items())
+    values = {}
+    for section in config.sections():
+        for option, value in config.items(section):
+            if option in defaults and defaults[option] == value:
+                continue
+            values.setdefault((section, option), []).append(value)
+    return values
+
+
+def _is_number(value, kind):
+    try:
+        return math.isfinite(kind(value))
+    except ValueError:
+        return False
+
+
+def _match_case(word, example):
+    if example.isupper():
+        return word.upper()
+    if example[:1].isupper():
+        return word.capitalize()
+    return word
+
+
+def infer_field(values):
+    """Suggest how a key should be validated from the values seen for it.
+
+    Returns a dict to merge into a field config: ``{"schema": ...}`` for
+    numbers, ``{"domain": ...}`` (or an enum schema when a value contains a
+    comma) for booleans and small repeated value sets, or ``{}`` for text.
+    """
+    observed = []
+    for value in values:
+        value = value.strip()
+        if value and value not in observed:
+            observed.append(value)
+    if not observed:
+        return {}
+    if all(_is_number(v, int) for v in observed):
+        return {"schema": {"type": "int"}}
+    if all(_is_number(v, float) for v in observed):
+        return {"schema": {"type": "float"}}
+
+    lowered = {v.lower() for v in observed}
+    for pair in BOOLEAN_PAIRS:
+        if lowered <= set(pair):
+            # Keep the spellings in the file valid and add the missing counterpart
+            choices = observed + [_match_case(word, observed[0]) for word in pair if word not in lowered]
+            return {"domain": ", ".join(choices)}
+
+    # Only call it an enum when values repeat, otherwise every key would become one
+    if 1 < len(observed) <= MAX_ENUM_VALUES and len(values) > len(observed):
+        if any("," in v for v in observed):
+            return {"schema": {"type": "enum", "values": observed}}
+        return {"domain": ", ".join(observed)}
+    return {}
+
+
+def describe_suggestion(suggestion):
+    """Return a short human-readable form of an ``infer_field`` result"""
+    if "domain" in suggestion:
+        return suggestion["domain"]
+    schema = suggestion.get("schema")
+    if schema is None:
+        return "text"
+    if schema["type"] == "enum":
+        return " | ".join(schema["values"])
+    return schema["type"]
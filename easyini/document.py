@@ -0,0 +1,528 @@
+"""Lossless, line-based INI document model and byte-level patches."""
+import configparser
+import copy
+import hashlib
+import os
+import re
+import threading
+
+
+class FileChangedError(Exception):
+    """The file on disk no longer matches the document being saved"""
+
+
+def content_digest(data):
+    """Return the hash IniDocument and IniPatch use to recognize file contents"""
+    return hashlib.blake2b(data, digest_size=20).digest()
+
+
+def decode(data):
+    """Split raw INI bytes into (BOM, lines with their line endings)"""
+    bom = b"\xef\xbb\xbf" if data.startswith(b"\xef\xbb\xbf") else b""
+    return bom, data[len(bom):].decode('utf-8', 'surrogateescape').splitlines(keepends=True)
+
+
+class _Synced:
+    """Size and hash of the file a document was last read from or written to.
+
+    The base of the document's next patch. ``data`` is only known for the
+    bytes the document was read from; after a failed write the next patch
+    rewrites the whole file and needs no old lines.
+    """
+
+    def __init__(self, size, digest=None, data=None):
+        self._size = size
+        self._digest = digest
+        self._data = data
+
+    def size(self):
+        return self._size
+
+    def digest(self):
+        if self._digest is None:
+            self._digest = content_digest(self._data)
+        return self._digest
+
+    def lines(self):
+        return decode(self._data)[1] if self._data else []
+
+
+# Patches are worked out in order along their chain of bases
+_resolve_lock = threading.RLock()
+
+
+class IniPatch:
+    """Edits produced by IniDocument.prepare_write.
+
+    Preparing a patch only takes the lines changed since the previous one:
+    ``changes`` maps lines rewritten in place to their text, and ``tail``
+    is (first line, all lines from there on) once lines were inserted or
+    removed. The file content, the byte-level ``chunks`` and the hashes are
+    worked out from ``base`` (the previous patch, or what the file held)
+    when first needed, normally on the writer thread.
+
+    When the file on disk no longer has the size and content hash of the
+    base, another program changed it and FileChangedError is raised rather
+    than writing at stale offsets or clobbering its changes.
+    """
+
+    def __init__(self, base, changes, tail, bom, origin=None):
+        self.bom = bom
+        self.origin = origin  # the IniDocument that prepared the patch
+        self._base = base
+        self._changes = changes
+        self._tail = tail
+        self._lines = None
+        self._data = None
+        self._digest = None
+
+    def _resolve(self):
+        with _resolve_lock:
+            # Iterate so a long chain of queued patches does not recurse
+            chain = []
+            patch = self
+            while isinstance(patch, IniPatch) and patch._data is None:
+                chain.append(patch)
+                patch = patch._base
+            for patch in reversed(chain):
+                patch._build()
+
+    def _build(self):
+        base = self._base
+        start, tail = self._tail if self._tail is not None else (None, None)
+        lines = [] if start == 0 else list(base.lines())
+        for index, line in self._changes.items():
+            lines[index] = line
+        if tail is not None:
+            lines[start:] = tail
+        encoded = [IniDocument.encode(line) for line in lines]
+        offsets = [len(self.bom)]
+        for line in encoded:
+            offsets.append(offsets[-1] + len(line))
+        self.chunks = [(offsets[i], encoded[i]) for i in sorted(self._changes)]
+        self.truncate = None
+        if tail is not None:
+            self.chunks.append((offsets[start], b"".join(encoded[start:])))
+            self.truncate = offsets[-1]
+        self.expected_size = base.size()
+        self.expected_digest = base.digest()
+        self._lines = lines
+        self._data = self.bom + b"".join(encoded)
+        # Later patches only need this one's result
+        self._base = self._changes = self._tail = None
+
+    def __getattr__(self, name):
+        # chunks, truncate, expected_size and expected_digest exist once resolved
+        if name in ("chunks", "truncate", "expected_size", "expected_digest"):
+            self._resolve()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def lines(self):
+        """Return the lines of the file once the patch is written"""
+        self._resolve()
+        return self._lines
+
+    def size(self):
+        return len(self.to_bytes())
+
+    def to_bytes(self):
+        self._resolve()
+        return self._data
+
+    def digest(self):
+        """Return the content hash of the file once the patch is written"""
+        if self._digest is None:
+            self._digest = content_digest(self.to_bytes())
+        return self._digest
+
+    def matches(self, data):
+        """Return True when ``data`` is the file content the patch was prepared against"""
+        return len(data) == self.expected_size and content_digest(data) == self.expected_digest
+
+    def apply(self, path):
+        """Write the patch to ``path`` in place, touching only the changed bytes.
+
+        Not crash-safe on its own; SaveScheduler only uses it when the file
+        cannot be atomically replaced.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found at {path}")
+        with open(path, 'r+b') as f:
+            if not self.matches(f.read()):
+                raise FileChangedError(f"{path} was modified by another program")
+            for offset, data in self.chunks:
+                f.seek(offset)
+                f.write(data)
+            if self.truncate is not None:
+                f.truncate(self.truncate)
+
+
+class IniDocument:
+    """Lossless, line-based model of an INI file.
+
+    Parsing follows ConfigParser's rules but keeps every original line, so
+    comments, ordering, whitespace, BOM and newline style survive a save.
+    Each key remembers the lines its value spans; ``set`` patches just those
+    lines and ``prepare_write`` turns the edits into byte-level writes.
+    Documents made by ``copy`` share the line index until one of them is
+    edited.
+    """
+
+    SECTION_RE = re.compile(r"\[(?P<header>.+)\]")
+    OPTION_RE = re.compile(r"(?P<option>.*?)\s*(?P<vi>[=:])\s*(?P<value>.*)$")
+
+    def __init__(self, data=b"", index=None):
+        self.bom, self.lines = decode(data)
+        self.newline = "\r\n" if "\r\n" in (self.lines[0] if self.lines else "") else "\n"
+        self.delimiter = " = "
+        # section -> {"header": line, "end": line after its last entry, "keys": {option: [first, stop, value_col]}}
+        self.sections = {}
+        if index is None:
+            self._parse()
+        else:
+            # Restored from a snapshot of the same bytes (see ``index``)
+            self.sections, self.delimiter = index
+        self._synced = _Synced(len(data), data=data)
+        self._dirty = set()
+        self._tail_from = None
+        self._shared = False
+        self._share_lock = threading.Lock()
+
+    def copy(self):
+        """Return an independent document; the line index is copied on the first edit of either"""
+        with self._share_lock:
+            self._shared = True
+            document = copy.copy(self)
+        document.lines = list(self.lines)
+        document._dirty = set(self._dirty)
+        document._share_lock = threading.Lock()
+        return document
+
+    def preload(self):
+        """Take a private copy of a shared index now, e.g. on a worker thread before the first edit"""
+        with self._share_lock:
+            if self._shared:
+                self.sections = {
+                    name: dict(entry, keys={option: list(key) for option, key in entry["keys"].items()})
+                    for name, entry in self.sections.items()
+                }
+                self._shared = False
+
+    def synced_digest(self):
+        """Return the content hash of the bytes the document was last synced with"""
+        return self._synced.digest()
+
+    def index(self):
+        """Return the parsed line index, which ``IniDocument(data, index)`` restores without parsing"""
+        return self.sections, self.delimiter
+
+    @classmethod
+    def load(cls, path):
+        """Read and parse the INI file at ``path``"""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    @staticmethod
+    def encode(line):
+        return line.encode('utf-8', 'surrogateescape')
+
+    def text(self):
+        """Return the document as text (without BOM), e.g. for ConfigParser.read_string"""
+        return "".join(self.lines)
+
+    def to_bytes(self):
+        return self.bom + b"".join(self.encode(line) for line in self.lines)
+
+    def _parse(self):
+        section = None
+        key = None
+        indent_level = 0
+        delimiter = None
+        for index, line in enumerate(self.lines):
+            body = line.rstrip("\r\n")
+            stripped = body.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            cur_indent_level = len(body) - len(body.lstrip())
+            if key is not None and cur_indent_level > indent_level:
+                key[1] = index + 1
+                section["end"] = index + 1
+                continue
+            key = None
+            header = self.SECTION_RE.match(stripped)
+            if header:
+                name = header.group("header")
+                section = self.sections.setdefault(name, {"header": index, "end": index + 1, "keys": {}})
+                section["end"] = max(section["end"], index + 1)
+                continue
+            match = self.OPTION_RE.match(body, cur_indent_level)
+            if section is None or not match or not match.group("option").strip():
+                continue
+            key = [index, index + 1, match.start("value")]
+            section["keys"][match.group("option").strip()] = key
+            section["end"] = index + 1
+            indent_level = cur_indent_level
+            if delimiter is None:
+                delimiter = body[match.end("option"):match.start("value")]
+        if delimiter and delimiter.strip() in "=:":
+            self.delimiter = delimiter
+
+    def get(self, section, option):
+        """Return the stored value, or None when the key does not exist"""
+        key = self.sections.get(section, {}).get("keys", {}).get(option)
+        if key is None:
+            return None
+        first, stop, value_col = key
+        parts = [self.lines[first].rstrip("\r\n")[value_col:].strip()]
+        for line in self.lines[first + 1:stop]:
+            stripped = line.strip()
+            if stripped and stripped[0] not in "#;":
+                parts.append(stripped)
+        return "\n".join(parts)
+
+    def set(self, section, option, value):
+        """Set ``section.option`` by patching only the lines it occupies"""
+        value = str(value)
+        self.preload()
+        entry = self.sections.get(section)
+        if entry is None:
+            self._append_section(section, option, value)
+            return
+        key = entry["keys"].get(option)
+        if key is None:
+            index = entry["end"]
+            option_lines = self._format_option(option, value)
+            self._insert_lines(index, option_lines)
+            entry["end"] = index + len(option_lines)
+            entry["keys"][option] = [index, entry["end"], len(option) + len(self.delimiter)]
+            return
+
+        first, stop, value_col = key
+        body = self.lines[first].rstrip("\r\n")
+        ending = self.lines[first][len(body):]
+        parts = value.split("\n")
+        head = body[:value_col] + parts[0]
+        if len(parts) == 1 and stop == first + 1:
+            # Common case: same single line, keep trailing whitespace and line ending
+            old_value = body[value_col:]
+            self._replace_line(first, head + old_value[len(old_value.rstrip()):] + ending)
+            return
+
+        last = self.lines[stop - 1]
+        last_ending = last[len(last.rstrip("\r\n")):]
+        new_lines = [head] + [f"\t{part}" for part in parts[1:]]
+        new_lines = [line + self.newline for line in new_lines[:-1]] + [new_lines[-1] + last_ending]
+        self._splice(first, stop, new_lines)
+        key[1] = first + len(new_lines)
+
+    def remove(self, section, option):
+        """Delete ``section.option`` and its continuation lines, if present"""
+        self.preload()
+        entry = self.sections.get(section)
+        key = entry["keys"].pop(option, None) if entry is not None else None
+        if key is None:
+            return
+        self._splice(key[0], key[1], [])
+
+    def _format_option(self, option, value):
+        parts = value.split("\n")
+        lines = [f"{option}{self.delimiter}{parts[0]}{self.newline}"]
+        lines += [f"\t{part}{self.newline}" for part in parts[1:]]
+        return lines
+
+    def _append_section(self, section, option, value):
+        index = len(self.lines)
+        new_lines = [self.newline] if self.lines else []
+        new_lines.append(f"[{section}]{self.newline}")
+        header = index + len(new_lines) - 1
+        option_lines = self._format_option(option, value)
+        self._insert_lines(index, new_lines + option_lines)
+        first = header + 1
+        key = [first, first + len(option_lines), len(option) + len(self.delimiter)]
+        self.sections[section] = {"header": header, "end": key[1], "keys": {option: key}}
+
+    def _replace_line(self, index, new_line):
+        old = self.lines[index]
+        if old == new_line:
+            return
+        self.lines[index] = new_line
+        if self._tail_from is not None and index >= self._tail_from:
+            return
+        if len(self.encode(old)) == len(self.encode(new_line)):
+            self._dirty.add(index)
+        else:
+            self._mark_tail(index)
+
+    def _insert_lines(self, index, new_lines):
+        if index > 0 and not self.lines[index - 1].endswith(("\n", "\r")):
+            self._replace_line(index - 1, self.lines[index - 1] + self.newline)
+        self._splice(index, index, new_lines)
+
+    def _splice(self, start, stop, new_lines):
+        self.lines[start:stop] = new_lines
+        delta = len(new_lines) - (stop - start)
+        self._mark_tail(start)
+        if not delta:
+            return
+        for entry in self.sections.values():
+            if entry["header"] >= stop:
+                entry["header"] += delta
+            # A section ending exactly at an insertion point is extended by the caller
+            if entry["end"] > start:
+                entry["end"] += delta
+            for key in entry["keys"].values():
+                if key[0] >= stop:
+                    key[0] += delta
+                    key[1] += delta
+
+    def _mark_tail(self, index):
+        if self._tail_from is None or index < self._tail_from:
+            self._tail_from = index
+        self._dirty = {i for i in self._dirty if i < self._tail_from}
+
+    def prepare_write(self):
+        """Turn the edits since the last call into an IniPatch and mark them synced.
+
+        Only the changed lines are taken here; the patch encodes and hashes
+        the content when the writer asks for it.
+        """
+        changes = {i: self.lines[i] for i in self._dirty}
+        tail = None
+        if self._tail_from is not None:
+            tail = (self._tail_from, self.lines[self._tail_from:])
+        patch = IniPatch(self._synced, changes, tail, self.bom, self)
+        self._synced = patch
+        self._dirty = set()
+        self._tail_from = None
+        return patch
+
+    def rollback(self, patch):
+        """Undo ``prepare_write``'s bookkeeping after ``patch`` failed to reach the disk.
+
+        Only valid while ``patch`` is the latest one prepared. The next patch
+        is based on the size the file still has and rewrites the whole
+        document, since the lines it changed are no longer tracked.
+        """
+        self._synced = _Synced(patch.expected_size, patch.expected_digest)
+        self._mark_tail(0)
+
+
+def parse_ini(data, source="<bytes>"):
+    """Parse raw INI bytes into (IniDocument, ConfigParser).
+
+    The document keeps the raw lines for lossless saves; the ConfigParser
+    (with key case preserved) serves lookups and views.
+    """
+    document = IniDocument(data)
+    config = configparser.ConfigParser()
+    # Preserve original key case
+    config.optionxform = str
+    config.read_string(document.text(), source=source)
+    return document, config
+
+
+def config_values(config):
+    """Return (defaults, {section: {option: raw value}}) of a parser made by ``parse_ini``.
+
+    Keys a section inherits unchanged from DEFAULT are left out.
+    """
+    defaults = dict(config.defaults())
+    sections = {}
+    for section in config.sections():
+        sections[section] = {
+            option: value for option, value in config.items(section, raw=True)
+            if option not in defaults or defaults[option] != value
+        }
+    return defaults, sections
+
+
+class _RestoringInterpolation(configparser.BasicInterpolation):
+    """BasicInterpolation that skips validating values while a parser is restored.
+
+    ``read_string`` never validates what it reads, but ``read_dict`` checks
+    every value, which rejects a lone ``%`` and dominates the restore time.
+    """
+
+    restoring = False
+
+    def before_set(self, parser, section, option, value):
+        if self.restoring:
+            return value
+        return super().before_set(parser, section, option, value)
+
+
+def config_from_values(defaults, sections, source="<dict>"):
+    """Build a parser like ``parse_ini``'s from ``config_values`` output"""
+    interpolation = _RestoringInterpolation()
+    config = configparser.ConfigParser(interpolation=interpolation)
+    config.optionxform = str
+    interpolation.restoring = True
+    try:
+        config.read_dict({config.default_section: defaults, **sections}, source=source)
+    finally:
+        interpolation.restoring = False
+    return config
+
+
+class CopyOnWriteConfig:
+    """ConfigParser stand-in that reads a shared parser until its first change.
+
+    The first change (or ``preload``) rebuilds a private parser with
+    ``config_from_values``, so the shared one is never modified and readers
+    that never write pay nothing for the copy.
+    """
+
+    _WRITES = frozenset(("set", "add_section", "remove_section", "remove_option",
+                         "read", "read_file", "read_string", "read_dict"))
+
+    def __init__(self, shared, source="<dict>"):
+        self._shared = shared
+        self._source = source
+        self._own = None
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """Build the private parser now, e.g. on a worker thread before the first edit"""
+        self._parser(write=True)
+
+    def _parser(self, write=False):
+        if self._own is None and write:
+            with self._lock:
+                if self._own is None:
+                    self._own = config_from_values(*config_values(self._shared), source=self._source)
+        return self._own if self._own is not None else self._shared
+
+    def __getattr__(self, name):
+        return getattr(self._parser(name in self._WRITES), name)
+
+    # SectionProxy binds these when it is created, so they must follow a later copy
+    def getint(self, *args, **kwargs):
+        return self._parser().getint(*args, **kwargs)
+
+    def getfloat(self, *args, **kwargs):
+        return self._parser().getfloat(*args, **kwargs)
+
+    def getboolean(self, *args, **kwargs):
+        return self._parser().getboolean(*args, **kwargs)
+
+    def __getitem__(self, section):
+        if section != self.default_section and not self.has_section(section):
+            raise KeyError(section)
+        # Writes through the proxy come back to ``set`` and ``remove_option`` here
+        return configparser.SectionProxy(self, section)
+
+    def __setitem__(self, section, values):
+        self._parser(write=True)[section] = values
+
+    def __delitem__(self, section):
+        del self._parser(write=True)[section]
+
+    def __contains__(self, section):
+        return section in self._parser()
+
+    def __iter__(self):
+        return iter(self._parser())
+
+    def __len__(self):
+        return len(self._parser())
@@ -0,0 +1,88 @@
+"""Bounded undo/redo history of per-key edits."""
+import time
+from collections import deque
+
+
+class EditHistory:
+    """Undo/redo stacks of per-key deltas rather than whole-file snapshots.
+
+    Each step records one key's value before and after the edit (None when
+    the key did not exist). Keystrokes on the same key less than
+    ``merge_window`` seconds apart collapse into one step, and the oldest
+    steps are dropped once the history exceeds ``max_bytes``.
+    """
+
+    # Rough fixed cost of one step on top of its strings
+    STEP_OVERHEAD = 120
+
+    def __init__(self, max_bytes=256 * 1024, merge_window=1.0):
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        self._undo = deque()  # [path, section, option, before, after, last edit time]
+        self._redo = []
+        self._size = 0
+        self._sealed = True
+
+    def record(self, path, section, option, before, after, now=None):
+        """Record that ``section.option`` in ``path`` changed from ``before`` to ``after``"""
+        if before == after:
+            return
+        now = time.monotonic() if now is None else now
+        self._redo.clear()
+        last = self._undo[-1] if self._undo else None
+        if (not self._sealed and last is not None and last[:3] == [path, section, option]
+                and now - last[5] < self.merge_window):
+            self._size -= self._cost(last)
+            last[4] = after
+            last[5] = now
+            if last[3] == last[4]:
+                # Typed back to where the step started
+                self._undo.pop()
+            else:
+                self._size += self._cost(last)
+        else:
+            step = [path, section, option, before, after, now]
+            self._undo.append(step)
+            self._size += self._cost(step)
+        self._sealed = False
+        while self._size > self.max_bytes and len(self._undo) > 1:
+            self._size -= self._cost(self._undo.popleft())
+
+    def undo(self):
+        """Return (path, section, option, value) restoring the last step, or None"""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._size -= self._cost(step)
+        self._redo.append(step)
+        self._sealed = True
+        return step[0], step[1], step[2], step[3]
+
+    def redo(self):
+        """Return (path, section, option, value) re-applying the last undone step, or None"""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        self._size += self._cost(step)
+        self._sealed = True
+        return step[0], step[1], step[2], step[4]
+
+    def seal(self):
+        """Start a new step on the next edit, even on the same key"""
+        self._sealed = True
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+        self._sealed = True
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def _cost(self, step):
+        return self.STEP_OVERHEAD + sum(len(part) for part in step[1:5] if part is not None)
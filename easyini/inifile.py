@@ -0,0 +1,76 @@
+"""Headless access to a configured INI file."""
+from .cache import ParseCache
+from .registry import find_file, load_config
+from .schema import compile_field
+from .storage import commit_patches
+
+_default_cache = ParseCache()
+
+
+class IniFile:
+    """An INI file opened for reading and patching without any GUI.
+
+    Values are read from and written to the lossless IniDocument, so saving
+    keeps comments and formatting and only rewrites what changed. ``fields``
+    are the configured field dicts from editor_config.json, if any.
+    """
+
+    def __init__(self, path, fields=(), name=None, cache=None):
+        self.path = path
+        self.name = name or path
+        self.fields = list(fields)
+        self.cache = cache or _default_cache
+        self.document, self.config = self.cache.get(path)
+
+    @classmethod
+    def from_config(cls, file_config, cache=None):
+        """Open a file entry from ``config_data["files"]``"""
+        return cls(file_config["path"], file_config.get("fields", []), file_config.get("name"), cache)
+
+    def get(self, section, option, default=None):
+        """Return the raw value of ``section.option``, or ``default`` if missing"""
+        value = self.document.get(section, option)
+        return default if value is None else value
+
+    def set(self, section, option, value):
+        """Change ``section.option`` in memory; call ``save`` to write it.
+
+        Raises ValueError when ``value`` breaks the configured field's schema.
+        """
+        value = str(value)
+        for field in self.fields:
+            if field["section"] == section and field["option"] == option:
+                error = compile_field(field).validate(value)
+                if error is not None:
+                    raise ValueError(f"{section}.{option}: {error}")
+        if self.document.get(section, option) == value:
+            return
+        self.document.set(section, option, value)
+        if not self.config.has_section(section):
+            self.config.add_section(section)
+        self.config[section][option] = value
+
+    def values(self):
+        """Return {(section, option): value} for every configured field"""
+        return {
+            (field["section"], field["option"]): self.get(field["section"], field["option"], "")
+            for field in self.fields
+        }
+
+    def save(self):
+        """Atomically write pending changes; raises FileChangedError on conflicts"""
+        patch = self.document.prepare_write()
+        error = commit_patches({self.path: [patch]}, self.cache.revalidate)
+        if error is not None:
+            self.document.rollback(patch)
+            raise error
+
+
+def open_file(name, config_data=None, cache=None):
+    """Open the configured file registered as ``name`` in editor_config.json"""
+    if config_data is None:
+        config_data = load_config()
+    file_config = find_file(config_data, name)
+    if file_config is None:
+        raise KeyError(f"No configured file named {name!r}")
+    return IniFile.from_config(file_config, cache)
@@ -0,0 +1,131 @@
+"""Opt-in latency instrumentation for EasyINI hot paths.
+
+Code wraps hot paths in ``metrics.timer("parse")`` and friends. While
+instrumentation is disabled (the default) the timer is a shared no-op.
+``enable`` turns on per-operation duration histograms and writes a periodic
+summary to a rotating log file through the ``easyini.perf`` logger.
+"""
+import bisect
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("easyini.perf")
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """Bucketed duration histogram with count, total and max"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + (self.max_ms,), self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def describe(self):
+        mean = self.total_ms / self.count if self.count else 0.0
+        return (f"n={self.count} mean={mean:.1f}ms p50<={self.percentile(0.5):.1f}ms "
+                f"p95<={self.percentile(0.95):.1f}ms max={self.max_ms:.1f}ms")
+
+
+class Instrumentation:
+    """Thread-safe registry of duration histograms keyed by operation name"""
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._summary_thread = None
+        self._stop = threading.Event()
+
+    def timer(self, name):
+        """Context manager timing its block under ``name`` (no-op when disabled)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(ms)
+
+    def summary(self):
+        """Return one line per operation, sorted by name"""
+        with self._lock:
+            return "\n".join(f"{name}: {h.describe()}" for name, h in sorted(self.histograms.items()))
+
+    def enable(self, log_path, summary_interval=60.0, max_bytes=1024 * 1024, backup_count=3):
+        """Start recording and write a summary to ``log_path`` every ``summary_interval`` seconds"""
+        if self.enabled:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        self.enabled = True
+        self._stop.clear()
+        self._summary_thread = threading.Thread(
+            target=self._summarize_periodically, args=(summary_interval,),
+            name="EasyINI-metrics", daemon=True
+        )
+        self._summary_thread.start()
+        logger.info("Instrumentation enabled")
+
+    def disable(self):
+        """Write a final summary and stop recording"""
+        if not self.enabled:
+            return
+        self._stop.set()
+        self.write_summary()
+        self.enabled = False
+
+    def write_summary(self):
+        text = self.summary()
+        if text:
+            logger.info("Latency summary\n%s", text)
+
+    def _summarize_periodically(self, interval):
+        while not self._stop.wait(interval):
+            self.write_summary()
+
+
+metrics = Instrumentation()
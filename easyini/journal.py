@@ -0,0 +1,282 @@
+"""Write-ahead journal of field edits that have not reached their INI file yet."""
+import json
+import logging
+import os
+import secrets
+import threading
+
+from .locking import lock_open_file
+from .registry import user_config_path
+from .storage import commit_patches, write_atomic
+
+logger = logging.getLogger("easyini")
+
+
+def journal_dir():
+    """Return the directory of per-instance journals next to the user's editor_config.json"""
+    return os.path.join(os.path.dirname(user_config_path()), 'journal')
+
+
+def journal_path():
+    """Return the single journal shared by all instances before journals were per instance"""
+    return os.path.join(os.path.dirname(user_config_path()), 'journal.jsonl')
+
+
+def orphaned_journals(directory=None):
+    """Return journals that may have been left by instances that crashed.
+
+    Journals of running instances are listed too; ``EditJournal.claim``
+    tells them apart.
+    """
+    directory = directory or journal_dir()
+    try:
+        paths = [entry.path for entry in os.scandir(directory) if entry.name.endswith(".jsonl")]
+    except FileNotFoundError:
+        paths = []
+    if directory == journal_dir() and os.path.exists(journal_path()):
+        paths.append(journal_path())
+    return sorted(paths)
+
+
+class EditJournal:
+    """Append-only log of edits, checkpointed once each file is written.
+
+    Every running editor has its own journal file, locked for as long as it
+    is open, so instances never checkpoint or truncate each other's edits.
+    Edits are appended by a background thread, which writes whatever has
+    queued up since its last write and fsyncs once, so a burst of
+    keystrokes costs one small append; an edit superseded by a later one to
+    the same key in that batch is not written at all. ``sync`` waits for
+    queued lines. The writer syncs the journal before it touches an INI
+    file, so an edit is always durable in the journal first.
+
+    When the writer reports that a file's patch is on disk, a checkpoint
+    line marks that file's edits as applied; once nothing is pending the
+    journal is truncated, and ``close`` deletes it. ``pending`` returns the
+    edits a crash left unapplied; ``claim`` opens another instance's journal
+    once that instance is gone.
+
+    Line formats::
+
+        {"seq": 7, "path": "...", "section": "...", "option": "...", "value": "..."}
+        {"checkpoint": "...", "seq": 7}
+
+    A ``value`` of null records that the key was removed.
+    """
+
+    def __init__(self, path=None, _file=None):
+        if path is None:
+            path = os.path.join(journal_dir(), f"{os.getpid()}-{secrets.token_hex(4)}.jsonl")
+        self.path = path
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._queue = []      # lines (or None for a truncate) waiting for the journal thread
+        self._queued = 0
+        self._synced = 0
+        self._thread = None
+        self._seq = 0
+        self._unapplied = {}  # INI path -> seq of its newest edit not yet written
+        if _file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            _file = open(self.path, 'ab')
+            lock_open_file(_file)
+        self._file = _file
+        for entry in self._read():
+            self._seq = max(self._seq, entry.get("seq", 0))
+        for entry in self.pending():
+            self._unapplied[entry["path"]] = entry["seq"]
+
+    @classmethod
+    def claim(cls, path):
+        """Open the journal at ``path`` for replay, or return None while its instance runs"""
+        try:
+            f = open(path, 'ab')
+        except FileNotFoundError:
+            return None
+        if not lock_open_file(f):
+            f.close()
+            return None
+        return cls(path, _file=f)
+
+    def _read(self):
+        try:
+            with open(self.path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A torn final line from a crash mid-append
+                continue
+        return entries
+
+    def pending(self):
+        """Return edits written to the journal but never checkpointed, oldest first"""
+        entries = self._read()
+        applied = {}
+        for entry in entries:
+            if "checkpoint" in entry:
+                path = entry["checkpoint"]
+                applied[path] = max(applied.get(path, 0), entry["seq"])
+        return [entry for entry in entries
+                if "checkpoint" not in entry and entry["seq"] > applied.get(entry["path"], 0)]
+
+    def append(self, path, section, option, value):
+        """Queue an edit for the journal; return its sequence number"""
+        with self._lock:
+            self._seq += 1
+            self._enqueue({"seq": self._seq, "path": path, "section": section, "option": option, "value": value})
+            self._unapplied[path] = self._seq
+            return self._seq
+
+    def last_seq(self, path):
+        """Return the newest unapplied sequence number for ``path``, or None"""
+        with self._lock:
+            return self._unapplied.get(path)
+
+    def checkpoint(self, path, seq):
+        """Mark the edits to ``path`` up to ``seq`` as written to the file"""
+        with self._lock:
+            if path in self._unapplied and self._unapplied[path] <= seq:
+                del self._unapplied[path]
+            if not self._unapplied:
+                self._enqueue(None)
+            else:
+                self._enqueue({"checkpoint": path, "seq": seq})
+
+    def retain(self, entries):
+        """Replace the journal's contents with the unapplied ``entries``, e.g. after a partial replay"""
+        self.sync()
+        with self._lock:
+            data = b"".join(json.dumps(entry).encode('utf-8') + b"\n" for entry in entries)
+            self._file.close()
+            write_atomic(self.path, data)
+            # The lock went with the replaced file; take it on the new one
+            self._file = open(self.path, 'ab')
+            lock_open_file(self._file)
+            self._unapplied = {}
+            for entry in entries:
+                self._unapplied[entry["path"]] = max(self._unapplied.get(entry["path"], 0), entry["seq"])
+
+    def sync(self):
+        """Wait until every queued line is fsynced"""
+        with self._cond:
+            target = self._queued
+            while self._synced < target:
+                self._cond.wait()
+
+    def close(self):
+        """Write queued lines and close; a journal with nothing unapplied is deleted"""
+        self.sync()
+        with self._cond:
+            if self._file is None:
+                return
+            if self._thread is not None:
+                # Tells the journal thread to exit
+                self._queue.append(False)
+                self._cond.notify_all()
+            self._file.close()
+            self._file = None
+            if not self._unapplied:
+                try:
+                    os.unlink(self.path)
+                except OSError as e:
+                    logger.debug("Could not remove the journal %s: %s", self.path, e)
+
+    def _enqueue(self, entry):
+        # Called with the lock held; None stands for a truncate
+        self._queue.append(entry)
+        self._queued += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="EasyINI-journal", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                batch, self._queue = self._queue, []
+                f = self._file
+            if False in batch:
+                batch = batch[:batch.index(False)]
+                stop = True
+            else:
+                stop = False
+            try:
+                if f is not None:
+                    self._write(f, batch)
+            except (OSError, ValueError) as e:
+                logger.error("Could not write the edit journal %s: %s", self.path, e)
+            with self._cond:
+                self._synced += len(batch)
+                self._cond.notify_all()
+                if stop:
+                    self._thread = None
+                    return
+
+    @staticmethod
+    def _write(f, batch):
+        if None in batch:
+            # Everything before the last truncate was applied
+            batch = batch[len(batch) - batch[::-1].index(None):]
+            f.truncate(0)
+        lines = []
+        seen = set()
+        for entry in reversed(batch):
+            if "checkpoint" not in entry:
+                key = (entry["path"], entry["section"], entry["option"])
+                if key in seen:
+                    # A later edit in this batch replaces the value on replay
+                    continue
+                seen.add(key)
+            lines.append(json.dumps(entry).encode('utf-8') + b"\n")
+        f.write(b"".join(reversed(lines)))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_pending(journal, cache):
+    """Apply the journal's unapplied edits to their files; return (count, errors).
+
+    Each file is patched through its IniDocument and written atomically, so
+    replaying an edit that did reach the disk just rewrites the same value.
+    The edits of files that could not be written stay in the journal for the
+    next replay; the rest are dropped from it.
+    """
+    by_path = {}
+    for entry in journal.pending():
+        by_path.setdefault(entry["path"], []).append(entry)
+
+    count = 0
+    errors = []
+    failed = []
+    for path, entries in by_path.items():
+        try:
+            document, config = cache.get(path)
+            for entry in entries:
+                section, option, value = entry["section"], entry["option"], entry["value"]
+                if value is None:
+                    document.remove(section, option)
+                    if config.has_section(section):
+                        config[section].pop(option, None)
+                    continue
+                document.set(section, option, value)
+                if not config.has_section(section):
+                    config.add_section(section)
+                config[section][option] = value
+            patch = document.prepare_write()
+            error = commit_patches({path: [patch]}, cache.revalidate)
+            if error is not None:
+                raise error
+            count += len(entries)
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+            failed.extend(entries)
+    if by_path:
+        journal.retain(sorted(failed, key=lambda entry: entry["seq"]))
+    return count, errors
@@ -0,0 +1,158 @@
+"""Lazily materialized parsing for large INI files.
+
+``LazyIniView`` memory-maps the file once to build a section -> byte range
+index and parses a section's keys only when that section is first asked
+for. It implements the subset of the ConfigParser API the editor uses
+(``sections``, ``has_section``, ``in``, ``[section]``, ``items``,
+``add_section``); sections are plain dicts of raw (uninterpolated) values.
+
+Only section headers starting in column 0 are indexed.
+"""
+import mmap
+import os
+import re
+import threading
+
+from .document import IniDocument
+
+SECTION_HEADER_RE = re.compile(rb"^\[(.+)\][ \t]*\r?$", re.MULTILINE)
+
+
+def index_sections(f):
+    """Return ({section: [(start, end), ...]}, file size) for an open binary file"""
+    size = os.fstat(f.fileno()).st_size
+    index = {}
+    if size == 0:
+        return index, size
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        previous = None
+        for match in SECTION_HEADER_RE.finditer(mapped):
+            if previous is not None:
+                previous[1] = match.start()
+            name = match.group(1).decode('utf-8', 'surrogateescape')
+            previous = [match.start(), size]
+            index.setdefault(name, []).append(previous)
+    return {name: [tuple(r) for r in ranges] for name, ranges in index.items()}, size
+
+
+class LazyIniView:
+    """ConfigParser-like view that parses sections on first access"""
+
+    lazy = True
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._sections = {}   # section -> dict once materialized, else None
+        self._ranges = {}     # section -> [(start, end), ...] in the indexed file
+        self._key = None
+        if path is not None:
+            with open(path, 'rb') as f:
+                self._reindex(f)
+
+    def copy(self):
+        """Return an independent view that shares this one's section index"""
+        with self._lock:
+            view = LazyIniView(None)
+            view.path = self.path
+            view._ranges = self._ranges
+            view._key = self._key
+            view._sections = {
+                name: None if values is None else dict(values) for name, values in self._sections.items()
+            }
+            return view
+
+    def _reindex(self, f):
+        ranges, _size = index_sections(f)
+        st = os.fstat(f.fileno())
+        self._key = (st.st_mtime_ns, st.st_size)
+        self._ranges = ranges
+        for name in ranges:
+            self._sections.setdefault(name, None)
+
+    def sections(self):
+        with self._lock:
+            return [name for name in self._sections if name != "DEFAULT"]
+
+    def has_section(self, section):
+        return section != "DEFAULT" and section in self._sections
+
+    def __contains__(self, section):
+        return section in self._sections or section == "DEFAULT"
+
+    def add_section(self, section):
+        with self._lock:
+            if section in self._sections:
+                raise ValueError(f"Section {section!r} already exists")
+            self._sections[section] = {}
+
+    def __getitem__(self, section):
+        with self._lock:
+            if section not in self._sections:
+                if section == "DEFAULT":
+                    return {}
+                raise KeyError(section)
+            values = self._sections[section]
+            if values is None:
+                values = self._sections[section] = self._materialize(section)
+            return values
+
+    def items(self, section):
+        return list(self[section].items())
+
+    def materialized(self):
+        """Return the names of sections whose keys have been parsed"""
+        with self._lock:
+            return [name for name, values in self._sections.items() if values is not None]
+
+    def _materialize(self, section):
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if (st.st_mtime_ns, st.st_size) != self._key:
+                # Written since indexing (e.g. by our own autosave): offsets moved
+                self._reindex(f)
+            chunks = []
+            for start, end in self._ranges.get(section, []):
+                f.seek(start)
+                chunks.append(f.read(end - start))
+        values = {}
+        if section != "DEFAULT" and "DEFAULT" in self._sections:
+            values.update(self["DEFAULT"])
+        for chunk in chunks:
+            document = IniDocument(chunk)
+            for option in document.sections.get(section, {}).get("keys", {}):
+                values[option] = document.get(section, option)
+        return values
+
+
+class DeferredDocument:
+    """Stand-in for an IniDocument that reads and parses the file on first use.
+
+    Opening a large file in lazy mode should not pay for the line model; it
+    is only needed once something is edited or saved.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._document = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._document is None:
+                with open(self._path, 'rb') as f:
+                    self._document = IniDocument(f.read())
+            return self._document
+
+    def preload(self):
+        """Read and parse the file now, e.g. on a worker thread before the first edit"""
+        self._load()
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+
+def parse_lazy(path):
+    """Return (DeferredDocument, LazyIniView, stat key) for ``path``"""
+    view = LazyIniView(path)
+    return DeferredDocument(path), view, view._key
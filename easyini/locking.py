@@ -0,0 +1,180 @@
+"""Advisory locks on INI files that EasyINI shares with other programs."""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to exclusively created lockfiles
+    fcntl = None
+    import msvcrt
+
+from .instrumentation import metrics
+
+logger = logging.getLogger("easyini")
+
+
+class LockTimeout(Exception):
+    """Another program held a file's lock for longer than the configured wait"""
+
+
+def lock_path(path):
+    """Return the lockfile guarding ``path`` where flock is unavailable, e.g. ``.station.ini.lock`` beside it"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.lock")
+
+
+def lock_open_file(f):
+    """Lock open file ``f`` exclusively for as long as it stays open.
+
+    Returns False at once when another process holds the lock. Used to mark
+    files that belong to a running EasyINI instance.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            # Windows locks byte ranges, and reading a locked range fails,
+            # so lock one far beyond anything the file will ever hold
+            position = f.tell()
+            f.seek(2 ** 40)
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            finally:
+                f.seek(position)
+    except OSError:
+        return False
+    return True
+
+
+class FileLocking:
+    """Cooperative locking around reads and writes of shared INI files.
+
+    With fcntl the INI file itself is flock()ed, shared for reads and
+    exclusive for writes, so no files are added beside it. Atomic renames
+    give the path a new inode, so after locking the lock is only kept if
+    the path still names the locked file; otherwise the new file is locked
+    instead. Without fcntl a hidden ``lock_path`` file is created
+    exclusively and deleted on release, and one older than ``stale_s`` is
+    taken to be left over from a crash.
+
+    Waits are recorded as the "lock_wait" metric. When the lock is not
+    free within ``timeout_ms``, ``policy`` decides: "proceed" logs a
+    warning and continues unlocked, "fail" raises LockTimeout. A lockfile
+    that cannot be created at all (read-only directory) never blocks.
+    """
+
+    POLICIES = ("proceed", "fail")
+
+    def __init__(self, timeout_ms=2000, policy="proceed", stale_s=30, enabled=True):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown lock policy {policy!r}; expected one of {', '.join(self.POLICIES)}")
+        self.timeout = timeout_ms / 1000
+        self.policy = policy
+        self.stale = stale_s
+        self.enabled = enabled
+
+    @contextmanager
+    def hold(self, path, shared=False):
+        """Hold the lock for ``path`` for the duration of the block"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        release = self._acquire(path, shared, start + self.timeout)
+        waited_ms = (time.perf_counter() - start) * 1000
+        metrics.record("lock_wait", waited_ms)
+        if release is None and waited_ms >= self.timeout * 1000:
+            if self.policy == "fail":
+                raise LockTimeout(f"{path} is locked by another program")
+            logger.warning("Lock on %s still held after %.0f ms; continuing without it", path, waited_ms)
+        try:
+            yield
+        finally:
+            if release is not None:
+                release()
+
+    def _acquire(self, path, shared, deadline):
+        """Return a release callable, or None when the lock was not taken"""
+        try:
+            if fcntl is not None:
+                return self._flock(path, shared, deadline)
+            return self._create(lock_path(path), deadline)
+        except OSError as e:
+            logger.debug("Cannot lock %s: %s", path, e)
+            return None
+
+    def _flock(self, path, shared, deadline):
+        mode = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        delay = 0.001
+        fd = os.open(path, os.O_RDONLY)
+        while True:
+            try:
+                fcntl.flock(fd, mode)
+            except BlockingIOError:
+                if time.perf_counter() >= deadline:
+                    os.close(fd)
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+                continue
+            try:
+                current = os.stat(path)
+            except OSError:
+                current = None
+            locked = os.fstat(fd)
+            if current is not None and (current.st_dev, current.st_ino) == (locked.st_dev, locked.st_ino):
+                if not shared:
+                    # Earlier versions flock()ed a sidecar lockfile and left it behind
+                    try:
+                        os.unlink(lock_path(path))
+                    except OSError:
+                        pass
+                return lambda: os.close(fd)
+            # Replaced while we waited; the lock must be on the file the path names now
+            os.close(fd)
+            fd = os.open(path, os.O_RDONLY)
+
+    def _create(self, path, deadline):
+        delay = 0.001
+        while True:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) > self.stale:
+                        os.unlink(path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            _hide(path)
+
+            def release():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    # Broken as stale by another process
+                    pass
+            return release
+
+
+def _hide(path):
+    """Set the Windows hidden attribute on ``path`` so lockfiles stay out of Explorer"""
+    try:
+        import ctypes
+        ctypes.windll.kernel32.SetFileAttributesW(str(path), 0x2)  # FILE_ATTRIBUTE_HIDDEN
+    except (ImportError, AttributeError, OSError):
+        pass
+
+
+# Used by commit_patches and ParseCache unless they are given another one
+default_locking = FileLocking()
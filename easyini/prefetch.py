@@ -0,0 +1,132 @@
+"""Background warming of parsed files and their editor view models."""
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from .cache import ParseCache
+from .records import FieldSpec, FieldTable
+from .search import SearchIndex
+
+logger = logging.getLogger("easyini")
+
+
+def build_view_model(document, config, fields):
+    """Return the editor's view model for the configured ``fields`` of a parsed file.
+
+    The model is a dict holding the IniDocument and parsed config it was
+    built from, the fields as FieldSpec records, their FieldTable of editor
+    state and a SearchIndex over the file. Nothing in ``config`` is modified.
+    """
+    specs = [FieldSpec.from_dict(field) for field in fields]
+    return {
+        "document": document,
+        "config": config,
+        "specs": specs,
+        "field_table": FieldTable(specs, config),
+        "search_index": SearchIndex.from_config(config)
+    }
+
+
+class Prefetcher:
+    """Parse configured files and build their view models on a thread pool.
+
+    Each model holds its own IniDocument and config from the ParseCache and
+    is handed out at most once: ``view_model`` gives it to the caller, who
+    may then edit it. A model is only handed out while the file is still the
+    version it was built from, so a file that changed on disk since gets a
+    fresh model on demand. ``active`` names the file open in the editor;
+    workers never build a model for it, and it is warmed again when another
+    file is activated.
+    """
+
+    def __init__(self, cache, workers=4, max_models=16):
+        self.cache = cache
+        self.workers = workers
+        self.max_models = max_models
+        self.active = None
+        self._models = OrderedDict()  # normalized path -> (stat key, view model)
+        self._fields = {}             # normalized path -> configured fields
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+
+    def prefetch(self, file_configs):
+        """Warm every file in ``file_configs``, replacing any earlier pending batch"""
+        with self._lock:
+            self._fields = {
+                ParseCache._normalize(f.get("path", "")): list(f.get("fields", [])) for f in file_configs
+            }
+            for future in self._futures:
+                future.cancel()
+            self._futures = [
+                self._submit(file_config.get("path", ""), list(file_config.get("fields", [])))
+                for file_config in file_configs
+            ]
+            for name in [name for name in self._models if name not in self._fields]:
+                del self._models[name]
+
+    def _submit(self, path, fields):
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="EasyINI-prefetch")
+        return self._executor.submit(self._warm, path, fields)
+
+    def view_model(self, path, fields):
+        """Take the view model for ``path``, building it now if none is current.
+
+        The model belongs to the caller afterwards and is not handed out again.
+        """
+        name = ParseCache._normalize(path)
+        specs = [FieldSpec.from_dict(f) for f in fields]
+        with self._lock:
+            key, model = self._models.pop(name, (None, None))
+        if model is not None and model["specs"] == specs:
+            try:
+                st = os.stat(path)
+                if key == (st.st_mtime_ns, st.st_size):
+                    return model
+            except OSError:
+                pass
+        document, config = self.cache.get(path)
+        return build_view_model(document, config, fields)
+
+    def activate(self, path):
+        """Mark ``path`` as the file open in the editor and re-warm the one before it"""
+        name = ParseCache._normalize(path)
+        with self._lock:
+            # A prefetched model of ``path`` stays for the view_model call that opens it
+            previous, self.active = self.active, name
+            if previous is not None and previous != name and previous in self._fields and self._executor is not None:
+                self._futures.append(self._submit(previous, self._fields[previous]))
+
+    def shutdown(self):
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _warm(self, path, fields):
+        try:
+            name = ParseCache._normalize(path)
+            st = os.stat(path)
+            with self._lock:
+                key, _model = self._models.get(name, (None, None))
+                if name == self.active or key == (st.st_mtime_ns, st.st_size):
+                    return
+            document, config, key = self.cache.load(path)
+            model = build_view_model(document, config, fields)
+            with self._lock:
+                # The user may have opened the file while the model was being built
+                if name != self.active:
+                    self._models[name] = (key, model)
+                    self._models.move_to_end(name)
+                    while len(self._models) > self.max_models:
+                        self._models.popitem(last=False)
+        except Exception as e:
+            # Missing or broken files are reported when the user opens them
+            logger.debug("Prefetch of %s failed: %s", path, e)
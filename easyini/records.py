@@ -0,0 +1,132 @@
+"""Compact records for configured files and fields and the editor's field state.
+
+editor_config.json keeps plain JSON objects; these records are what the
+editor works with once a file is opened. ``__slots__`` keeps them small
+when a file has thousands of configured fields.
+"""
+from .schema import compile_domain
+
+
+class FieldSpec:
+    """One configured field: where it lives and which values it accepts"""
+
+    __slots__ = ("section", "option", "domain", "schema", "label")
+
+    def __init__(self, section, option, domain="", schema=None, label=None):
+        self.section = section
+        self.option = option
+        self.domain = domain
+        self.schema = schema
+        self.label = label  # custom display name; None means "SECTION.option"
+
+    @classmethod
+    def from_dict(cls, field):
+        section = field["section"]
+        option = field["option"]
+        label = field.get("display") or None
+        if label == f"{section}.{option}":
+            label = None
+        return cls(section, option, field.get("domain", ""), field.get("schema"), label)
+
+    def to_dict(self):
+        field = {"section": self.section, "option": self.option, "domain": self.domain}
+        if self.schema is not None:
+            field["schema"] = self.schema
+        if self.label:
+            field["display"] = self.label
+        return field
+
+    @property
+    def key(self):
+        return (self.section, self.option)
+
+    @property
+    def display(self):
+        return self.label or f"{self.section}.{self.option}"
+
+    def compile(self):
+        """Return the cached FieldSchema for this field"""
+        return compile_domain(self.domain, self.schema)
+
+    def __eq__(self, other):
+        if not isinstance(other, FieldSpec):
+            return NotImplemented
+        return (self.section, self.option, self.domain, self.schema, self.label) == \
+            (other.section, other.option, other.domain, other.schema, other.label)
+
+    def __repr__(self):
+        return f"FieldSpec({self.section!r}, {self.option!r})"
+
+
+class FileSpec:
+    """One configured INI file and its fields"""
+
+    __slots__ = ("name", "path", "fields")
+
+    def __init__(self, name, path, fields=()):
+        self.name = name
+        self.path = path
+        self.fields = list(fields)
+
+    @classmethod
+    def from_dict(cls, file_config):
+        return cls(
+            file_config.get("name", file_config.get("path", "")),
+            file_config.get("path", ""),
+            [FieldSpec.from_dict(field) for field in file_config.get("fields", [])]
+        )
+
+    def to_dict(self):
+        return {"name": self.name, "path": self.path, "fields": [field.to_dict() for field in self.fields]}
+
+    def __repr__(self):
+        return f"FileSpec({self.name!r}, {self.path!r}, {len(self.fields)} fields)"
+
+
+class FieldTable:
+    """Editor state for a file's fields, held column-wise by field index.
+
+    ``specs[i]``, ``values[i]``, ``choices[i]`` and ``schemas[i]`` all
+    describe field ``i``; the editor rows, saving and preview highlighting
+    read these lists directly.
+    """
+
+    __slots__ = ("specs", "values", "choices", "schemas", "_positions")
+
+    def __init__(self, specs=(), config=None):
+        self.specs = list(specs)
+        self.schemas = [spec.compile() for spec in self.specs]
+        self.choices = [schema.choices for schema in self.schemas]
+        self.values = [""] * len(self.specs)
+        self._positions = {}  # (section, option) -> field indices showing that key
+        for index, spec in enumerate(self.specs):
+            self._positions.setdefault(spec.key, []).append(index)
+        if config is not None:
+            self.sync(config)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def keys(self):
+        """Return the (section, option) pairs of all fields"""
+        return self._positions.keys()
+
+    def positions(self, section, option):
+        """Return the indices of the fields bound to ``section.option``"""
+        return self._positions.get((section, option), ())
+
+    def set_value(self, section, option, value):
+        for index in self.positions(section, option):
+            self.values[index] = value
+
+    def sync(self, config):
+        """Load values from ``config``; return True if any changed"""
+        changed = False
+        for index, spec in enumerate(self.specs):
+            value = ""
+            if config.has_section(spec.section) and spec.option in config[spec.section]:
+                value = config[spec.section][spec.option]
+            if self.values[index] != value:
+                self.values[index] = value
+                changed = True
+        return changed
@@ -0,0 +1,81 @@
+"""Field registry: the list of configured files and fields in editor_config.json."""
+import json
+import os
+import sys
+
+from .schema import compile_field
+from .storage import write_atomic
+
+
+def user_config_path():
+    """Return a user-writable config path under %APPDATA%/EasyINI/editor_config.json"""
+    base = os.environ.get('APPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming')
+    app_dir = os.path.join(base, 'EasyINI')
+    return os.path.join(app_dir, 'editor_config.json')
+
+
+def resource_path(filename):
+    """Get absolute path to resource (works for dev and for PyInstaller exe)"""
+    if hasattr(sys, '_MEIPASS'):
+        # When running as PyInstaller bundle
+        base_path = sys._MEIPASS
+    else:
+        # When running from source or installed exe
+        base_path = os.path.dirname(os.path.abspath(sys.argv[0]))
+    return os.path.join(base_path, filename)
+
+
+def load_config(config_path=None):
+    """Load configuration from JSON in user AppData; create/migrate as needed."""
+    config_path = config_path or user_config_path()
+
+    # Default config
+    default_config = {"files": []}
+
+    # Try loading from AppData
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading config from AppData: {e} → using defaults")
+
+    # Migrate default from alongside the exe if present
+    bundled_path = resource_path("editor_config.json")
+    try:
+        if os.path.exists(bundled_path):
+            with open(bundled_path, 'r') as f:
+                data = json.load(f)
+            os.makedirs(os.path.dirname(config_path), exist_ok=True)
+            write_atomic(config_path, json.dumps(data, indent=2).encode('utf-8'))
+            return data
+    except Exception as e:
+        print(f"Error migrating bundled config: {e}")
+
+    # Create new default in AppData
+    try:
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        write_atomic(config_path, json.dumps(default_config, indent=2).encode('utf-8'))
+    except Exception as e:
+        print(f"Error creating config in AppData: {e}")
+    return default_config
+
+
+def save_config(config_data, config_path=None):
+    """Save configuration to JSON file in user AppData."""
+    config_path = config_path or user_config_path()
+    os.makedirs(os.path.dirname(config_path), exist_ok=True)
+    write_atomic(config_path, json.dumps(config_data, indent=2).encode('utf-8'))
+
+
+def domain_values(field):
+    """Return the allowed values for a field, or None when it takes typed text"""
+    return compile_field(field).choices
+
+
+def find_file(config_data, name):
+    """Return the file config registered under ``name``, or None"""
+    for file_config in config_data.get("files", []):
+        if file_config["name"] == name:
+            return file_config
+    return None
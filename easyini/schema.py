@@ -0,0 +1,127 @@
+"""Typed validation rules for configured fields.
+
+A field's rules come from its ``schema`` object in editor_config.json, or
+from the older comma separated ``domain`` string, which means an enum::
+
+    {"section": "DECODE", "option": "MODE", "domain": "FAST, SLOW"}
+    {"section": "DECODE", "option": "GAIN", "schema": {"type": "int", "min": 0, "max": 64}}
+    {"section": "DECODE", "option": "RATIO", "schema": {"type": "float", "min": 0, "max": 1}}
+    {"section": "DECODE", "option": "CALIBRATION",
+     "schema": {"type": "text", "pattern": "[0-9A-F]+", "max_length": 32}}
+
+``pattern`` (matched against the whole value), ``min_length`` and
+``max_length`` may be combined with any type. Schemas are compiled once
+into FieldSchema objects and cached, so validating a keystroke is cheap.
+"""
+import functools
+import json
+import math
+import re
+
+
+class FieldSchema:
+    """Compiled validation rules for one field"""
+
+    TYPES = ("text", "enum", "int", "float")
+
+    def __init__(self, kind="text", values=None, minimum=None, maximum=None,
+                 pattern=None, min_length=None, max_length=None):
+        if kind not in self.TYPES:
+            raise ValueError(f"Unknown field type {kind!r}; expected one of {', '.join(self.TYPES)}")
+        if kind == "enum" and not values:
+            raise ValueError("An enum field needs a list of values")
+        self.kind = kind
+        self.values = [str(v) for v in values] if kind == "enum" else None
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_length = min_length
+        self.max_length = max_length
+        try:
+            self.pattern = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid pattern {pattern!r}: {e}") from None
+        self._allowed = frozenset(self.values or ())
+
+    @classmethod
+    def from_dict(cls, schema):
+        """Compile a schema object as found in editor_config.json"""
+        if not isinstance(schema, dict):
+            raise ValueError("A field schema must be a JSON object")
+        return cls(
+            schema.get("type", "text"),
+            values=schema.get("values"),
+            minimum=schema.get("min"),
+            maximum=schema.get("max"),
+            pattern=schema.get("pattern"),
+            min_length=schema.get("min_length"),
+            max_length=schema.get("max_length")
+        )
+
+    @property
+    def choices(self):
+        """Allowed values for a dropdown, or None when the field takes typed text"""
+        return self.values
+
+    def validate(self, value):
+        """Return why ``value`` is not allowed, or None when it is"""
+        if self.min_length is not None and len(value) < self.min_length:
+            return f"must be at least {self.min_length} characters"
+        if self.max_length is not None and len(value) > self.max_length:
+            return f"must be at most {self.max_length} characters"
+        if self.kind == "enum":
+            if value not in self._allowed:
+                return f"{value!r} is not one of {', '.join(self.values)}"
+        elif self.kind == "int":
+            try:
+                number = int(value.strip())
+            except ValueError:
+                return f"{value!r} is not a whole number"
+            error = self._check_range(number)
+            if error:
+                return error
+        elif self.kind == "float":
+            try:
+                number = float(value.strip())
+            except ValueError:
+                return f"{value!r} is not a number"
+            if not math.isfinite(number):
+                return f"{value!r} is not a finite number"
+            error = self._check_range(number)
+            if error:
+                return error
+        if self.pattern is not None and not self.pattern.fullmatch(value):
+            return f"{value!r} does not match {self.pattern.pattern}"
+        return None
+
+    def _check_range(self, number):
+        if self.minimum is not None and number < self.minimum:
+            return f"must be at least {self.minimum}"
+        if self.maximum is not None and number > self.maximum:
+            return f"must be at most {self.maximum}"
+        return None
+
+
+TEXT = FieldSchema()
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(domain, schema_json):
+    if schema_json is not None:
+        return FieldSchema.from_dict(json.loads(schema_json))
+    if domain:
+        return FieldSchema("enum", values=[v.strip() for v in domain.split(",")])
+    return TEXT
+
+
+def compile_domain(domain="", schema=None):
+    """Return the cached FieldSchema for a CSV ``domain`` or a ``schema`` object.
+
+    Raises ValueError when the schema is malformed.
+    """
+    schema_json = json.dumps(schema, sort_keys=True) if schema is not None else None
+    return _compile(domain or "", schema_json)
+
+
+def compile_field(field):
+    """Return the cached FieldSchema for a field config dict"""
+    return compile_domain(field.get("domain", ""), field.get("schema"))
@@ -0,0 +1,205 @@
+"""Inverted prefix index over the sections, keys and values of a parsed file."""
+import bisect
+import itertools
+import re
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the lowercase search tokens of ``text``.
+
+    Words are split on non-word characters; words containing underscores
+    also contribute their parts, so "key_0001" is found by "key" and "0001".
+    """
+    tokens = set()
+    for word in TOKEN_RE.findall(str(text).lower()):
+        tokens.add(word)
+        if "_" in word:
+            tokens.update(part for part in word.split("_") if part)
+    return tokens
+
+
+class SearchIndex:
+    """Token -> rows index supporting prefix queries and in-place updates.
+
+    Rows are (section, option) pairs. Section names are indexed once per
+    section rather than per row. A query is whitespace-separated terms that
+    must all match. Terms are split into words like indexed text, so
+    "1.25" or "10.0.0.1" must match all of their words: every word but the
+    last must equal a token of the row's section, key or value, and the
+    last must be a prefix of one. ``section:``, ``key:`` and ``value:``
+    restrict a term to one of those.
+    """
+
+    FIELDS = ("section", "key", "value")
+
+    def __init__(self):
+        self._postings = {field: {} for field in self.FIELDS}  # field -> token -> set of rows/sections
+        self._tokens = {field: [] for field in self.FIELDS}    # field -> sorted tokens
+        self._values = {}          # (section, option) -> indexed value
+        self._order = {}           # (section, option) or section -> insertion ordinal
+        self._counter = itertools.count()
+
+    @classmethod
+    def from_config(cls, config):
+        index = cls()
+        index.rebuild(config)
+        return index
+
+    def rebuild(self, config):
+        """Index every section of ``config``; lazy views contribute parsed sections only"""
+        self.__init__()
+        materialized = set(config.materialized()) if getattr(config, "lazy", False) else None
+        for section in config.sections():
+            self.add_section(section)
+            if materialized is not None and section not in materialized:
+                continue
+            for option, value in config.items(section):
+                self.update(section, option, value)
+
+    def sync(self, config):
+        """Bring the index in line with ``config``, re-tokenizing changed rows only"""
+        if getattr(config, "lazy", False):
+            self.rebuild(config)
+            return
+        sections = config.sections()
+        seen = set()
+        for section in sections:
+            self.add_section(section)
+            for option, value in config.items(section):
+                seen.add((section, option))
+                self.update(section, option, value)
+        for row in [row for row in self._values if row not in seen]:
+            self.remove(*row)
+        present = set(sections)
+        for section in [s for s in self._order if isinstance(s, str) and s not in present]:
+            self._remove_section(section)
+
+    def add_section(self, section):
+        if section in self._order:
+            return
+        self._order[section] = next(self._counter)
+        for token in tokenize(section):
+            self._add_posting("section", token, section)
+
+    def update(self, section, option, value):
+        """Index or re-index one row"""
+        row = (section, option)
+        old = self._values.get(row)
+        if row in self._values:
+            if old == value:
+                return
+            for token in tokenize(old):
+                self._remove_posting("value", token, row)
+        else:
+            self.add_section(section)
+            self._order[row] = next(self._counter)
+            for token in tokenize(option):
+                self._add_posting("key", token, row)
+        self._values[row] = value
+        for token in tokenize(value):
+            self._add_posting("value", token, row)
+
+    def remove(self, section, option):
+        row = (section, option)
+        if row not in self._values:
+            return
+        for token in tokenize(option):
+            self._remove_posting("key", token, row)
+        for token in tokenize(self._values.pop(row)):
+            self._remove_posting("value", token, row)
+        del self._order[row]
+
+    def search(self, query):
+        """Return [(section, options)] matching ``query`` in file order.
+
+        ``options`` is None when the section name alone matches every term,
+        meaning the whole section matches.
+        """
+        terms = self._parse_query(query)
+        if not terms:
+            return []
+        matched = [(self._match(fields - {"section"}, word, exact), self._match(fields & {"section"}, word, exact))
+                   for fields, word, exact in terms]
+
+        whole = set.intersection(*(sections for _rows, sections in matched))
+        partial = {}
+        for row in set().union(*(rows for rows, _sections in matched)):
+            if row[0] in whole:
+                continue
+            if all(row in rows or row[0] in sections for rows, sections in matched):
+                partial.setdefault(row[0], []).append(row)
+
+        result = [(section, None) for section in whole]
+        result.extend((section, [option for _s, option in sorted(rows, key=self._order.__getitem__)])
+                      for section, rows in partial.items())
+        result.sort(key=lambda entry: self._order[entry[0]])
+        return result
+
+    def matches(self, query, section, option):
+        """Return True when one row matches ``query``"""
+        row = (section, option)
+        section_tokens = tokenize(section)
+        row_tokens = {"key": tokenize(option), "value": tokenize(self._values.get(row, ""))}
+        for fields, word, exact in self._parse_query(query):
+            tokens = set(section_tokens) if "section" in fields else set()
+            for field in fields - {"section"}:
+                tokens |= row_tokens[field]
+            if word not in tokens if exact else not any(token.startswith(word) for token in tokens):
+                return False
+        return True
+
+    def _parse_query(self, query):
+        """Return [(fields, word, exact)] conditions that must all hold"""
+        conditions = []
+        for term in query.lower().split():
+            field, sep, rest = term.partition(":")
+            if sep and field in self.FIELDS and rest:
+                fields, term = {field}, rest
+            else:
+                fields = set(self.FIELDS)
+            # Split like tokenize(); a term without any word characters cannot match
+            words = TOKEN_RE.findall(term)
+            conditions.extend((fields, word, i < len(words) - 1) for i, word in enumerate(words))
+        return conditions
+
+    def _match(self, fields, word, exact=False):
+        found = set()
+        for field in fields:
+            postings = self._postings[field]
+            if exact:
+                found |= postings.get(word, set())
+                continue
+            tokens = self._tokens[field]
+            position = bisect.bisect_left(tokens, word)
+            while position < len(tokens) and tokens[position].startswith(word):
+                found |= postings[tokens[position]]
+                position += 1
+        return found
+
+    def _add_posting(self, field, token, item):
+        postings = self._postings[field]
+        entries = postings.get(token)
+        if entries is None:
+            entries = postings[token] = set()
+            bisect.insort(self._tokens[field], token)
+        entries.add(item)
+
+    def _remove_posting(self, field, token, item):
+        postings = self._postings[field]
+        entries = postings.get(token)
+        if entries is None:
+            return
+        entries.discard(item)
+        if not entries:
+            del postings[token]
+            tokens = self._tokens[field]
+            del tokens[bisect.bisect_left(tokens, token)]
+
+    def _remove_section(self, section):
+        for row in [row for row in self._values if row[0] == section]:
+            self.remove(*row)
+        for token in tokenize(section):
+            self._remove_posting("section", token, section)
+        del self._order[section]
@@ -0,0 +1,137 @@
+"""Persistent snapshots of parsed INI files, so unchanged files skip parsing."""
+import hashlib
+import logging
+import marshal
+import os
+import threading
+import time
+
+from .document import IniDocument, config_from_values, config_values
+from .registry import user_config_path
+from .storage import write_atomic
+
+logger = logging.getLogger("easyini")
+
+# Bump when the snapshot layout or the parser's output changes
+FORMAT = 2
+
+
+def snapshot_dir():
+    """Return the snapshot directory next to the user's editor_config.json"""
+    return os.path.join(os.path.dirname(user_config_path()), 'snapshots')
+
+
+class SnapshotStore:
+    """Directory of marshalled (IniDocument index, ConfigParser values) pairs.
+
+    A snapshot is named after a hash of the file's bytes and the file's
+    st_mtime_ns, so it is only used for identical content with the same
+    modification time. Loading one costs a hash of bytes that are read for
+    the document anyway; the parser is rebuilt through ``read_dict``.
+    Snapshots are written and old ones evicted on a background thread, so a
+    parse miss does not wait for the disk. Snapshots not used for
+    ``max_age_days`` are deleted, and the oldest go first once the
+    directory holds more than ``max_bytes``.
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024, max_age_days=30):
+        self.directory = directory or snapshot_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}    # snapshot path -> payload waiting to be written
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def _path(self, digest, mtime_ns):
+        return os.path.join(self.directory, f"{digest}-{mtime_ns}.snap")
+
+    def load(self, data, mtime_ns, digest=None):
+        """Return (IniDocument, ConfigParser) for ``data`` from its snapshot, or None"""
+        digest = digest or self.digest(data)
+        path = self._path(digest, mtime_ns)
+        try:
+            with open(path, 'rb') as f:
+                version, size, index, defaults, sections = marshal.loads(f.read())
+            if version != FORMAT or size != len(data):
+                self.misses += 1
+                return None
+            config = config_from_values(defaults, sections)
+            # Used snapshots stay young for age-based eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # Torn write or a snapshot from another Python version
+            logger.debug("Ignoring unusable snapshot %s: %s", path, e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return IniDocument(data, index), config
+
+    def save(self, data, document, config, mtime_ns, digest=None):
+        """Snapshot freshly parsed ``document`` and ``config`` for ``data`` in the background"""
+        digest = digest or self.digest(data)
+        # Serialized now: the caller may start editing the objects right away
+        payload = marshal.dumps((FORMAT, len(data), document.index(), *config_values(config)))
+        with self._cond:
+            self._pending[self._path(digest, mtime_ns)] = payload
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="EasyINI-snapshots", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Wait until every snapshot passed to ``save`` is written"""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                pending, self._pending = self._pending, {}
+                self._writing = True
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for path, payload in pending.items():
+                    write_atomic(path, payload)
+                self.evict()
+            except OSError as e:
+                logger.debug("Could not write snapshots to %s: %s", self.directory, e)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def evict(self):
+        """Delete expired snapshots, then the least recently used beyond ``max_bytes``"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".snap"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            return
+        entries.sort()
+        cutoff = time.time() - self.max_age
+        total = sum(size for _mtime, size, _path in entries)
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,278 @@
+"""Crash-safe writes: atomic file replacement and grouped commits."""
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+
+from .background import retry_io
+from .document import FileChangedError
+from .instrumentation import metrics
+from .locking import default_locking
+
+logger = logging.getLogger("easyini")
+
+
+def stage_file(path, data):
+    """Write ``data`` to a fsynced temp file next to ``path`` and return its name"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            # Keep the original file's permissions across the rename
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def sync_directory(directory):
+    """Make a rename inside ``directory`` durable (no-op where unsupported)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, data):
+    """Replace ``path`` with ``data`` via temp file + fsync + os.replace"""
+    tmp_path = stage_file(path, data)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    sync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _apply_locked(patch, path, locking):
+    with locking.hold(path):
+        patch.apply(path)
+
+
+def commit_patches(group, on_written=None, locking=None):
+    """Atomically write every file in ``group`` and return the last error, if any.
+
+    ``group`` maps a path to the IniPatches prepared for it, oldest first.
+    Each file is staged to a fsynced temp file, then all of them are renamed
+    into place and each directory is synced once. The file is checked
+    against the size and content hash the patches expect before staging;
+    its advisory lock (``locking``, default ``default_locking``) is only
+    held while its size and mtime are compared with that read and it is
+    renamed. ``on_written`` is called with every path that reached the disk.
+    """
+    locking = locking or default_locking
+    error = None
+    staged = []
+    for path, patches in group.items():
+        try:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"File not found at {path}")
+            # Read and hash before locking; under the lock only the stat is compared
+            with open(path, 'rb') as f:
+                if not patches[0].matches(f.read()):
+                    raise FileChangedError(f"{path} was modified by another program")
+                st = os.fstat(f.fileno())
+            checked = (st.st_size, st.st_mtime_ns)
+            staged.append((path, stage_file(path, patches[-1].to_bytes()), patches, checked))
+        except Exception as e:
+            error = e
+
+    directories = set()
+    for path, tmp_path, patches, checked in staged:
+        try:
+            try:
+                with locking.hold(path):
+                    # Another program may have written since the content was checked
+                    st = os.stat(path)
+                    if (st.st_size, st.st_mtime_ns) != checked:
+                        raise FileChangedError(f"{path} was modified by another program")
+                    try:
+                        os.replace(tmp_path, path)
+                        replaced = True
+                    except PermissionError:
+                        replaced = False
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            if not replaced:
+                # Another program holds the file open without delete sharing (common
+                # on Windows); patch the changed bytes in place instead. Our lock is
+                # only held for each attempt, not while retry_io backs off.
+                os.unlink(tmp_path)
+                for patch in patches:
+                    retry_io(_apply_locked, patch, path, locking)
+            directories.add(os.path.dirname(os.path.abspath(path)))
+            if on_written:
+                on_written(path)
+        except Exception as e:
+            error = e
+
+    for directory in directories:
+        try:
+            sync_directory(directory)
+        except OSError as e:
+            error = e
+    return error
+
+
+class GroupCommitWriter:
+    """Worker thread that commits queued IniPatches in groups.
+
+    ``durability`` decides how often groups are committed:
+
+    - ``"per-edit"``: as soon as a patch is submitted
+    - ``"per-interval"``: at most once every ``interval_ms``
+    - ``"on-close"``: only when ``flush`` is called
+
+    Whatever the policy, ``flush`` commits immediately and blocks until
+    everything submitted is on disk. With a ``journal``, patches submitted
+    with a ``journal_seq`` checkpoint the journal once their file is written.
+
+    Patches whose commit failed are kept and committed again, ahead of the
+    next patch from the same document, so the chain of expected sizes stays
+    intact. A patch from a different document (the file was re-read) drops
+    them.
+    ``locking`` is the FileLocking passed to ``commit_patches``.
+
+    The content hashes of recently committed patches are kept, so a file
+    watcher can tell our own writes (see ``wrote``) from another program's,
+    even when it sees the file before ``on_written`` has run. They are
+    computed on the worker, before the file is written.
+    """
+
+    RECENT_DIGESTS = 8
+
+    DURABILITY_POLICIES = ("per-edit", "per-interval", "on-close")
+
+    def __init__(self, on_written=None, durability="per-edit", interval_ms=2000, journal=None, locking=None):
+        if durability not in self.DURABILITY_POLICIES:
+            logger.warning("Unknown durability policy %r, using per-edit", durability)
+            durability = "per-edit"
+        self.on_written = on_written  # called on the worker thread with each written path
+        self.durability = durability
+        self.interval = interval_ms / 1000
+        self.journal = journal
+        self.locking = locking
+        self._queue = {}      # path -> IniPatches waiting for the worker, in order
+        self._journal_seqs = {}  # path -> newest journal seq covered by the queued patches
+        self._failed = {}     # path -> (patches, journal seq) of a commit that failed
+        self._recent = {}     # path -> content hashes of the latest submitted patches
+        self._busy = False
+        self._flush_requested = False
+        self._last_commit = 0.0
+        self._error = None
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="EasyINI-writer", daemon=True)
+        self._worker.start()
+
+    def submit(self, path, patch, journal_seq=None):
+        """Queue ``patch`` for ``path``; ``journal_seq`` is the newest journaled edit it includes"""
+        with self._cond:
+            failed = self._failed.pop(path, None)
+            if failed is not None and failed[0][-1].origin is patch.origin:
+                self._queue[path] = list(failed[0])
+                if failed[1] is not None:
+                    self._journal_seqs[path] = failed[1]
+            self._queue.setdefault(path, []).append(patch)
+            if journal_seq is not None:
+                self._journal_seqs[path] = journal_seq
+            self._cond.notify_all()
+
+    def wrote(self, path, digest):
+        """Return True when content hashing to ``digest`` came from a patch submitted for ``path``"""
+        with self._cond:
+            return digest in self._recent.get(os.path.normcase(os.path.abspath(path)), ())
+
+    def idle(self):
+        """Return True when nothing is queued or being written"""
+        with self._cond:
+            return not self._queue and not self._busy
+
+    def take_error(self):
+        """Return and clear the last write error"""
+        with self._cond:
+            error, self._error = self._error, None
+        return error
+
+    def flush(self):
+        """Commit everything queued now and wait; re-raise the last write error"""
+        with self._cond:
+            # Give commits that failed earlier another chance
+            for path, (patches, journal_seq) in self._failed.items():
+                self._queue[path] = list(patches) + self._queue.get(path, [])
+                if journal_seq is not None:
+                    self._journal_seqs.setdefault(path, journal_seq)
+            self._failed.clear()
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._queue or self._busy:
+                self._cond.wait()
+            self._flush_requested = False
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _written(self, path, journal_seq):
+        if self.on_written:
+            self.on_written(path)
+        if self.journal is not None and journal_seq is not None:
+            self.journal.checkpoint(path, journal_seq)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue or (self.durability == "on-close" and not self._flush_requested):
+                    self._cond.wait()
+                if self.durability == "per-interval":
+                    # Let more edits join the group until the interval has passed
+                    deadline = self._last_commit + self.interval
+                    while not self._flush_requested and time.monotonic() < deadline:
+                        self._cond.wait(deadline - time.monotonic())
+                group, self._queue = self._queue, {}
+                journal_seqs, self._journal_seqs = self._journal_seqs, {}
+                self._busy = True
+            written = set()
+
+            def on_written(path):
+                written.add(path)
+                self._written(path, journal_seqs.get(path))
+
+            # Encoding and hashing happen here rather than on the submitting thread,
+            # still before the file changes on disk
+            digests = {path: [patch.digest() for patch in patches] for path, patches in group.items()}
+            with self._cond:
+                for path, path_digests in digests.items():
+                    recent = self._recent.setdefault(os.path.normcase(os.path.abspath(path)), [])
+                    recent.extend(digest for digest in path_digests if digest not in recent)
+                    del recent[:-self.RECENT_DIGESTS]
+            if self.journal is not None and journal_seqs:
+                # The edits must be in the journal before their file is touched
+                self.journal.sync()
+            with metrics.timer("write"):
+                error = commit_patches(group, on_written, self.locking)
+            self._last_commit = time.monotonic()
+            with self._cond:
+                self._busy = False
+                if error is not None:
+                    self._error = error
+                    for path, patches in group.items():
+                        if path in written:
+                            continue
+                        queued = self._queue.get(path)
+                        if queued is None:
+                            self._failed[path] = (patches, journal_seqs.get(path))
+                        elif queued[0].origin is patches[-1].origin:
+                            # Newer patches arrived meanwhile; they build on the failed ones
+                            self._queue[path] = patches + queued
+                self._cond.notify_all()
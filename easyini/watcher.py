@@ -0,0 +1,124 @@
+"""Background watcher reporting external changes to INI files."""
+import logging
+import os
+import select
+import sys
+import threading
+
+from .cache import ParseCache
+
+logger = logging.getLogger("easyini")
+
+
+class FileWatcher:
+    """Background thread that reports external changes to a set of files.
+
+    Changes are detected by comparing (st_mtime_ns, st_size). On Linux the
+    thread sleeps on inotify watches of the files' directories so changes
+    are seen almost immediately; elsewhere it polls every ``interval``
+    seconds. ``on_change`` is called on the watcher thread.
+    """
+
+    INOTIFY_MASK = 0x2 | 0x8 | 0x80 | 0x100 | 0x200  # MODIFY, CLOSE_WRITE, MOVED_TO, CREATE, DELETE
+
+    def __init__(self, on_change, interval=1.0, settle=0.2):
+        self.on_change = on_change
+        self.interval = interval
+        self.settle = settle
+        self._paths = {}      # normalized path -> (path, last stat key)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._libc = None
+        self._inotify_fd = None
+        self._watches = {}    # directory -> inotify watch descriptor
+        self._thread = threading.Thread(target=self._run, name="EasyINI-watcher", daemon=True)
+
+    def start(self):
+        self._init_inotify()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def set_paths(self, paths):
+        """Replace the watched set; newly added files start from their current state"""
+        with self._lock:
+            watched = {}
+            for path in paths:
+                name = ParseCache._normalize(path)
+                previous = self._paths.get(name)
+                watched[name] = previous if previous is not None else (path, self._stat_key(path))
+            self._paths = watched
+        self._sync_watches()
+
+    @staticmethod
+    def _stat_key(path):
+        try:
+            return ParseCache._stat_key(os.stat(path))
+        except OSError:
+            return None
+
+    def _init_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0))
+            if fd < 0:
+                return
+            self._libc = libc
+            self._inotify_fd = fd
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify unavailable, polling for file changes: %s", e)
+        self._sync_watches()
+
+    def _sync_watches(self):
+        if self._inotify_fd is None:
+            return
+        with self._lock:
+            directories = {os.path.dirname(name) for name in self._paths}
+        for directory in list(self._watches):
+            if directory not in directories:
+                self._libc.inotify_rm_watch(self._inotify_fd, self._watches.pop(directory))
+        for directory in directories - set(self._watches):
+            wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(directory), self.INOTIFY_MASK)
+            if wd >= 0:
+                self._watches[directory] = wd
+
+    def _wait(self):
+        if self._inotify_fd is None:
+            self._stop.wait(self.interval)
+            return
+        readable, _, _ = select.select([self._inotify_fd], [], [], self.interval)
+        if readable:
+            # The events only wake us up; the stat comparison decides what changed
+            try:
+                while os.read(self._inotify_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wait()
+            with self._lock:
+                candidates = [(name, path, key) for name, (path, key) in self._paths.items()
+                              if self._stat_key(path) != key]
+            if not candidates:
+                continue
+            # Let the writer finish before reading the file
+            self._stop.wait(self.settle)
+            for name, path, _old in candidates:
+                key = self._stat_key(path)
+                with self._lock:
+                    if name not in self._paths:
+                        continue
+                    self._paths[name] = (path, key)
+                if key is None:
+                    continue
+                try:
+                    self.on_change(path)
+                except Exception as e:
+                    logger.exception("Error handling change to %s: %s", path, e)
@@ -1,15 +1,409 @@
+import time
+_STARTED = time.perf_counter()
+
+import copy
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import configparser
-import json
 import os, sys
-import sv_ttk
-import subprocess
+import json
 import logging
+import threading
+
+import easyini
+# Only what the window needs to open; optional subsystems are imported where they are used
+from easyini import BackgroundIO, EditHistory, FieldSpec, FieldTable, FileLocking, FileSpec, FileWatcher, GroupCommitWriter, ParseCache, Prefetcher, SearchIndex, metrics
+
+logger = logging.getLogger("easyini")
+
+
+class StartupProfile:
+    """Per-phase startup timings, printed when ``--startup-profile`` is given"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []   # (name, milliseconds)
+        self.first_window_ms = 0.0
+        self._last = _STARTED
+
+    def mark(self, name):
+        """Record the time spent since the previous mark under ``name``"""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self, out=None):
+        if not self.enabled:
+            return
+        out = out or sys.stdout
+        total = (self._last - _STARTED) * 1000
+        out.write("EasyINI startup profile\n")
+        for name, ms in self.phases:
+            out.write(f"  {name:<24}{ms:9.1f} ms\n")
+        out.write(f"  {'time-to-first-window':<24}{self.first_window_ms:9.1f} ms\n")
+        out.write(f"  {'total':<24}{total:9.1f} ms\n")
+        out.flush()
+
+
+class StallMonitor:
+    """Log Tk main-loop stalls longer than ``threshold_ms``.
+
+    A heartbeat is scheduled every ``interval_ms``; when it runs late by more
+    than the threshold, the event loop was blocked for that long.
+    """
+
+    def __init__(self, root, threshold_ms=200, interval_ms=100):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self._expected = 0.0
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        late_ms = (time.perf_counter() - self._expected) * 1000
+        if late_ms > self.threshold_ms:
+            metrics.record("stall", late_ms)
+            logging.getLogger("easyini.perf").warning("Tk main loop stalled for %.0f ms", late_ms)
+        self.start()
+
+
+class SaveScheduler:
+    """Debounce autosaves on the Tk thread and hand them to the core writer.
+
+    Edits scheduled within ``delay_ms`` of each other collapse into a single
+    IniPatch, prepared on the Tk thread once the quiet window ends and
+    committed by the GroupCommitWriter on its worker thread. ``on_state`` is
+    called on the Tk thread with "pending", "flushed" or "error".
+    """
+
+    def __init__(self, root, writer, delay_ms=400, on_state=None):
+        self.root = root
+        self.writer = writer
+        self.delay_ms = delay_ms
+        self.on_state = on_state
+        self._after_id = None
+        self._poll_id = None
+        self._target = None   # (path, document) waiting for the quiet window
+
+    def schedule(self, path, document):
+        """Request that ``document``'s edits be written to ``path`` once edits go quiet"""
+        if self._target is not None and self._target[0] != path:
+            self._commit()
+        self._target = (path, document)
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.writer.durability != "on-close":
+            self._after_id = self.root.after(self.delay_ms, self._commit)
+        self._notify("pending")
+
+    def pending(self):
+        """Return True while any scheduled write has not reached the disk"""
+        return self._target is not None or not self.writer.idle()
+
+    def commit(self):
+        """Hand any pending edit to the writer now without waiting for it"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._commit()
+
+    def flush(self):
+        """Commit any pending edit now and wait for the writer to finish"""
+        self.commit()
+        self.writer.flush()
+
+    def _commit(self):
+        self._after_id = None
+        if self._target is None:
+            return
+        path, document = self._target
+        self._target = None
+        journal = self.writer.journal
+        journal_seq = journal.last_seq(path) if journal is not None else None
+        self.writer.submit(path, document.prepare_write(), journal_seq)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(50, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        if not self.writer.idle():
+            self._poll_id = self.root.after(50, self._poll)
+            return
+        if self._target is not None:
+            return
+        error = self.writer.take_error()
+        if error is not None:
+            self._notify("error", str(error))
+        else:
+            self._notify("flushed")
+
+    def _notify(self, state, detail=None):
+        if self.on_state:
+            self.on_state(state, detail)
+
+
+class IoDispatcher:
+    """Run file I/O on the core BackgroundIO pool and call back on the Tk thread.
+
+    Finished tasks are collected by polling with ``root.after``, so
+    ``on_done(result)`` and ``on_error(exception)`` always run on the Tk
+    thread. A task still running past its timeout gets ``on_error`` with a
+    TimeoutError and its late result is dropped. ``on_busy`` is called with
+    the labels of the running tasks whenever that list changes.
+    """
+
+    def __init__(self, root, io, on_busy=None, poll_ms=25):
+        self.root = root
+        self.io = io
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self._tasks = []      # (IoTask, on_done, on_error)
+        self._poll_id = None
+
+    def run(self, func, *args, on_done=None, on_error=None, timeout=None, label=None):
+        """Start ``func(*args)`` on a worker and return its IoTask"""
+        task = self.io.submit(func, *args, timeout=timeout, label=label)
+        self._tasks.append((task, on_done, on_error))
+        self._notify()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return task
+
+    def busy(self):
+        return bool(self._tasks)
+
+    def _poll(self):
+        self._poll_id = None
+        now = time.monotonic()
+        running = []
+        finished = []
+        for entry in self._tasks:
+            task = entry[0]
+            if task.cancelled:
+                continue
+            if task.done() or task.expired(now):
+                finished.append(entry)
+            else:
+                running.append(entry)
+        changed = len(running) != len(self._tasks)
+        self._tasks = running
+        if changed:
+            self._notify()
+        for task, on_done, on_error in finished:
+            try:
+                if not task.done():
+                    task.cancel()
+                    raise TimeoutError(f"{task.label} timed out after {task.timeout:g}s")
+                result = task.future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    logger.error("%s failed: %s", task.label, e)
+                continue
+            if on_done:
+                on_done(result)
+        if self._tasks:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _notify(self):
+        if self.on_busy:
+            self.on_busy([task.label for task, _on_done, _on_error in self._tasks if not task.cancelled])
+
+
+class EditorRow:
+    """Widgets of one recycled editor row and the field index it shows"""
+
+    __slots__ = ("frame", "label", "combo", "entry", "value_var", "window", "normal_fg", "index")
+
+    def __init__(self, frame, label, combo, entry, value_var, window):
+        self.frame = frame
+        self.label = label
+        self.combo = combo
+        self.entry = entry
+        self.value_var = value_var
+        self.window = window
+        self.normal_fg = entry.cget("fg")
+        self.index = None
+
+
+class FieldRow:
+    """Widgets of one row in the field configuration dialog"""
+
+    __slots__ = ("frame", "section_var", "option_var", "domain_text", "label")
+
+    def __init__(self, frame, section_var, option_var, domain_text, label=None):
+        self.frame = frame
+        self.section_var = section_var
+        self.option_var = option_var
+        self.domain_text = domain_text
+        self.label = label
+
+    @property
+    def key(self):
+        return self.section_var.get().strip(), self.option_var.get().strip()
+
+    def to_spec(self):
+        """Return the FieldSpec this row describes, or None if it is incomplete.
+
+        Raises ValueError when the domain box holds a malformed JSON schema.
+        """
+        section = self.section_var.get().strip()
+        option = self.option_var.get().strip()
+        if not section or not option:
+            return None
+        domain = self.domain_text.get("1.0", "end-1c").strip()
+        if domain.startswith("{"):
+            # A JSON object is a typed schema rather than a CSV domain
+            spec = FieldSpec(section, option, schema=json.loads(domain), label=self.label)
+            spec.compile()
+            return spec
+        return FieldSpec(section, option, domain, label=self.label)
+
+
+class VirtualFieldList:
+    """Windowed list of editor field rows drawn on a Canvas.
+
+    Only rows inside the viewport are materialized and their widgets are
+    recycled as the user scrolls. Values live in the ``fields`` FieldTable,
+    so saving never has to read the widgets. A keystroke that fails the
+    field's schema is shown in red and reported to ``on_invalid``; it never
+    reaches the model or ``on_change``.
+    """
+
+    ROW_HEIGHT = 72
+    INVALID_FG = "#ff4d4d"
+
+    def __init__(self, canvas, scrollbar, on_change, on_invalid=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.on_change = on_change
+        self.on_invalid = on_invalid
+        self.fields = FieldTable()
+        self._rows = {}   # field index -> EditorRow currently showing it
+        self._free = []   # EditorRows ready for reuse
+        self._layout_id = None
+        canvas.configure(yscrollcommand=self._on_scroll)
+        canvas.bind("<Configure>", lambda e: self._schedule_layout())
+
+    def set_fields(self, fields):
+        """Show a new FieldTable, starting from the top"""
+        self.fields = fields
+        for row in self._rows.values():
+            self._release(row)
+        self._rows = {}
+        self.canvas.configure(scrollregion=(0, 0, 0, len(fields) * self.ROW_HEIGHT))
+        self.canvas.yview_moveto(0)
+        self.layout()
+
+    def refresh(self):
+        """Push model values into the rows currently on screen"""
+        for index, row in self._rows.items():
+            row.value_var.set(self.fields.values[index])
+            self._mark_row(row, None)
+
+    def layout(self):
+        """Materialize rows for the visible range and recycle the rest"""
+        self._layout_id = None
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.ROW_HEIGHT)
+        first = max(0, int(top // self.ROW_HEIGHT))
+        last = min(len(self.fields), int((top + height) // self.ROW_HEIGHT) + 1)
+        visible = range(first, last)
+
+        for index in [i for i in self._rows if i not in visible]:
+            self._release(self._rows.pop(index))
+
+        width = self.canvas.winfo_width()
+        for index in visible:
+            row = self._rows.get(index)
+            if row is None:
+                row = self._free.pop() if self._free else self._create_row()
+                self._bind_row(row, index)
+                self._rows[index] = row
+            self.canvas.coords(row.window, 0, index * self.ROW_HEIGHT)
+            self.canvas.itemconfigure(row.window, width=width)
+
+    def _schedule_layout(self):
+        if self._layout_id is None:
+            self._layout_id = self.canvas.after_idle(self.layout)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_layout()
+
+    def _create_row(self):
+        frame = tk.Frame(self.canvas, height=self.ROW_HEIGHT)
+        frame.pack_propagate(False)
+
+        # Field label
+        label_frame = tk.Frame(frame, height=25, width=40)
+        label_frame.pack(fill=tk.X)
+        label_frame.pack_propagate(False)
+        label = tk.Label(label_frame, font=('Arial', 9, 'bold'), fg="#FFFFFF")
+        label.pack(side=tk.LEFT, padx=8, pady=3)
+
+        # Value input frame; a row shows either the dropdown or the textbox
+        input_frame = tk.Frame(frame, padx=8, pady=8)
+        input_frame.pack(fill=tk.X)
+        value_var = tk.StringVar()
+        combo = ttk.Combobox(input_frame, textvariable=value_var, state="readonly", font=('Arial', 9), width=40)
+        entry = tk.Entry(input_frame, textvariable=value_var, font=('Arial', 9), width=40)
+
+        window = self.canvas.create_window(0, -self.ROW_HEIGHT, window=frame, anchor="nw", height=self.ROW_HEIGHT)
+        row = EditorRow(frame, label, combo, entry, value_var, window)
+        combo.bind("<<ComboboxSelected>>", lambda e: self._on_row_changed(row))
+        entry.bind("<KeyRelease>", lambda e: self._on_row_changed(row))
+        return row
+
+    def _bind_row(self, row, index):
+        fields = self.fields
+        row.index = index
+        row.label.config(text=fields.specs[index].display)
+        choices = fields.choices[index]
+        if choices is not None:
+            row.entry.pack_forget()
+            row.combo.config(values=choices)
+            row.combo.pack(fill=tk.X, pady=2, expand=True)
+        else:
+            row.combo.pack_forget()
+            row.entry.pack(fill=tk.X, pady=2, expand=True)
+        row.value_var.set(fields.values[index])
+        self._mark_row(row, None)
+
+    def _mark_row(self, row, error):
+        row.entry.config(fg=self.INVALID_FG if error else row.normal_fg)
+
+    def _release(self, row):
+        # Keep keystrokes from landing in a row that now shows another field
+        if self.canvas.focus_get() in (row.entry, row.combo):
+            self.canvas.focus_set()
+        row.index = None
+        self.canvas.coords(row.window, 0, -self.ROW_HEIGHT)
+        self._free.append(row)
+
+    def _on_row_changed(self, row):
+        index = row.index
+        if index is None:
+            return
+        value = row.value_var.get()
+        error = self.fields.schemas[index].validate(value)
+        self._mark_row(row, error)
+        if error is not None:
+            if self.on_invalid:
+                self.on_invalid(index, error)
+            return
+        self.fields.values[index] = value
+        self.on_change(index, row.value_var)
+
 
 class Editor:
-    def __init__(self, root):
+    def __init__(self, root, profile=None):
         self.root = root
+        self.profile = profile or StartupProfile()
         self.root.title("EasyINI")
         self.root.geometry("1200x800")
 
@@ -18,20 +412,154 @@ class Editor:
 
         #Data storage
         self.config_data = self.load_config()
+        self.profile.mark("load config")
+        self.setup_instrumentation()
         self.current_file = None
         self.current_ini_data = None
+        self.current_document = None
         self.config_unlocked = False
+        self._status_reset_id = None
+        self.preview_sections = None  # section -> (header, table_frame, tree)
+        self.preview_rows = None      # (section, option) -> (tree, item id)
+        self.preview_mode = "tables"  # "tables" or the virtualized "tree"
+        self.preview_populated = set()
+        self.preview_tree_items = {}  # tree item id -> section (tree mode)
+        self.search_index = SearchIndex()
+        self.preview_query = ""       # active preview filter, "" when unfiltered
+        self.preview_filtered = False # True while the tree shows filter results
+        self.editor_fields = FieldTable()  # field state behind the editor rows
+        self.field_entries = []       # fields of the open configuration dialog: FieldRows, then FieldSpecs without widgets yet
+        self.field_rows_built = 0     # leading field_entries that are FieldRows
+        self._field_rows_after = None # pending after_idle id that builds the next rows
+        self.locking = FileLocking(
+            timeout_ms=self.config_data.get("lock_timeout_ms", 2000),
+            policy=self.config_data.get("lock_policy", "proceed"),
+            enabled=self.config_data.get("file_locking", True)
+        )
+        snapshots = None
+        if self.config_data.get("snapshot_cache", True):
+            from easyini.snapshot import SnapshotStore
+            snapshots = SnapshotStore(
+                max_bytes=self.config_data.get("snapshot_cache_mb", 64) * 1024 * 1024,
+                max_age_days=self.config_data.get("snapshot_max_age_days", 30)
+            )
+        self.parse_cache = ParseCache(
+            self.config_data.get("parse_cache_mb", 256) * 1024 * 1024,
+            mode=self.config_data.get("parse_mode", "auto"),
+            lazy_threshold=self.config_data.get("lazy_threshold_mb", 4) * 1024 * 1024,
+            snapshots=snapshots,
+            locking=self.locking
+        )
+        self.prefetcher = Prefetcher(self.parse_cache, workers=self.config_data.get("prefetch_workers", 4))
+        self.history = EditHistory(
+            max_bytes=self.config_data.get("undo_budget_kb", 256) * 1024,
+            merge_window=self.config_data.get("undo_merge_ms", 1000) / 1000
+        )
+        self.journal = None
+        if self.config_data.get("journal", True):
+            from easyini.journal import EditJournal
+            self.journal = EditJournal()
+        self.replay_journal()
+        self.writer = GroupCommitWriter(
+            on_written=self.parse_cache.revalidate,
+            # "per-interval" writes the file less often; journaled edits survive a crash either way
+            durability=self.config_data.get("durability", "per-edit"),
+            interval_ms=self.config_data.get("durability_interval_ms", 2000),
+            journal=self.journal,
+            locking=self.locking
+        )
+        self.save_scheduler = SaveScheduler(
+            root,
+            self.writer,
+            delay_ms=self.config_data.get("autosave_delay_ms", 400),
+            on_state=self.on_save_state
+        )
+        self.io = IoDispatcher(
+            root,
+            BackgroundIO(
+                workers=self.config_data.get("io_workers", 2),
+                attempts=self.config_data.get("io_retries", 5),
+                backoff_ms=self.config_data.get("io_backoff_ms", 50),
+                timeout_s=self.config_data.get("io_timeout_s", 30)
+            ),
+            on_busy=self.on_io_busy
+        )
+        self._load_task = None        # IoTask reading the file being opened
+        self._config_task = None      # IoTask writing editor_config.json
+        self._config_dirty = False    # config changed again while it was being written
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._local_edits = {}        # (section, option) -> value not yet confirmed on disk
+        self._external_changes = []   # (path, document, config) parsed by the watcher
+        self._external_lock = threading.Lock()
+        self.file_watcher = FileWatcher(
+            self.on_external_change,
+            interval=self.config_data.get("watch_interval_ms", 1000) / 1000
+        )
 
         self.main_container = tk.Frame(root, bg='#000B0F')
         self.main_container.pack(fill=tk.BOTH, expand=True)
 
         self.notebook = ttk.Notebook(self.main_container)
         self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        self.create_config_page()
-        self.create_editor_page()
+
+        # Tabs start empty; their widgets are built the first time they are shown
+        self.files_tree = None
+        self.file_selector = None
+        self.config_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.config_frame, text="Config")
+        self.editor_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(self.editor_frame, text="Editor")
+        self._page_builders = {
+            str(self.config_frame): self.create_config_page,
+            str(self.editor_frame): self.create_editor_page
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.build_page(self.config_frame)
+        self.profile.mark("build first page")
+
+        self.refresh_file_list()
+        self.file_watcher.start()
+        self.root.after(250, self.apply_external_changes)
+        self.profile.mark("start background work")
+
+    def setup_instrumentation(self):
+        """Turn on latency histograms and stall logging when enabled in the config"""
+        settings = self.config_data.get("instrumentation", {})
+        if not settings.get("enabled"):
+            return
+        log_path = settings.get("log_path") or os.path.join(
+            os.path.dirname(self._get_user_config_path()), "logs", "perf.log"
+        )
+        metrics.enable(log_path, summary_interval=settings.get("summary_interval_s", 60))
+        StallMonitor(self.root, settings.get("stall_threshold_ms", 200)).start()
+
+    def on_tab_changed(self, event):
+        """Build a notebook page the first time it is selected"""
+        self.build_page(self.notebook.select())
+
+    def build_page(self, page):
+        """Run a page's builder once, then refresh lists that live on it"""
+        builder = self._page_builders.pop(str(page), None)
+        if builder is None:
+            return
+        builder()
         self.refresh_file_list()
 
+    def on_close(self):
+        """Make sure the last edit lands on disk before the window closes"""
+        self.file_watcher.stop()
+        self.prefetcher.shutdown()
+        self._flush_config()
+        self.io.io.shutdown()
+        try:
+            self.save_scheduler.flush()
+        except Exception as e:
+            logger.error("Error saving pending changes on close: %s", e)
+        if self.journal is not None:
+            self.journal.close()
+        metrics.disable()
+        self.root.destroy()
+
     def setup_styling(self):
         style = ttk.Style()
         style.theme_use("clam")  # clam allows full custom styling
@@ -95,8 +623,6 @@ class Editor:
 
     def create_config_page(self):
         """Create the configuration page"""
-        self.config_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.config_frame, text="Config")
     
         # File configuration section
         file_frame = ttk.Frame(self.config_frame, style="Card.TFrame")
@@ -325,73 +851,112 @@ class Editor:
         if file_config:
             self.show_fields_dialog(file_config)
 
+    def replay_journal(self):
+        """Write edits left in the journals of crashed instances to their files"""
+        if self.journal is None:
+            return
+        from easyini.journal import EditJournal, orphaned_journals, replay_pending
+
+        count = 0
+        errors = []
+        for path in orphaned_journals():
+            if path == self.journal.path:
+                continue
+            # None while the instance that owns the journal is still running
+            orphan = EditJournal.claim(path)
+            if orphan is None:
+                continue
+            try:
+                replayed, failed = replay_pending(orphan, self.parse_cache)
+                count += replayed
+                errors.extend(failed)
+            except OSError as e:
+                logger.error("Could not read the edit journal %s: %s", path, e)
+            finally:
+                # Kept while it still holds edits that could not be written
+                orphan.close()
+        if count:
+            logger.info("Recovered %d unsaved edits from the journal", count)
+        if errors:
+            messagebox.showwarning("Warning", "Some unsaved edits could not be recovered:\n" + "\n".join(errors))
+
+    def _journal_edit(self, section, option, value):
+        """Record an edit to the current file before it is scheduled for saving"""
+        if self.journal is not None and self.current_file and 'path' in self.current_file:
+            self.journal.append(self.current_file['path'], section, option, value)
+
     def load_config(self):
         """Load configuration from JSON in user AppData; create/migrate as needed."""
-        config_path = self._get_user_config_path()
-
-        # Default config
-        default_config = {"files": []}
+        return easyini.load_config(self._get_user_config_path())
 
-        # Try loading from AppData
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading config from AppData: {e} → using defaults")
+    def save_config(self):
+        """Save configuration to JSON file in user AppData, on the I/O pool.
 
-        # Migrate default from alongside the exe if present
-        bundled_path = resource_path("editor_config.json")
-        try:
-            if os.path.exists(bundled_path):
-                with open(bundled_path, 'r') as f:
-                    data = json.load(f)
-                os.makedirs(os.path.dirname(config_path), exist_ok=True)
-                with open(config_path, 'w') as f:
-                    json.dump(data, f, indent=2)
-                return data
-        except Exception as e:
-            print(f"Error migrating bundled config: {e}")
+        Writes never overlap: a change made while one runs is written once it
+        has finished.
+        """
+        if self._config_task is not None:
+            self._config_dirty = True
+            return
+        self._config_dirty = False
+        self._config_task = self.io.run(
+            easyini.save_config,
+            copy.deepcopy(self.config_data),
+            self._get_user_config_path(),
+            on_done=lambda _result: self._on_config_saved(),
+            on_error=lambda e: self._on_config_saved(e),
+            label="Saving settings"
+        )
 
-        # Create new default in AppData
-        try:
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
-        except Exception as e:
-            print(f"Error creating config in AppData: {e}")
-        return default_config
+    def _on_config_saved(self, error=None):
+        self._config_task = None
+        if error is not None:
+            messagebox.showerror("Error", f"Could not save settings: {str(error)}")
+        if self._config_dirty:
+            self.save_config()
 
-    def save_config(self):
-        """Save configuration to JSON file in user AppData."""
-        config_path = self._get_user_config_path()
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(self.config_data, f, indent=2)
+    def _flush_config(self):
+        """Finish writing editor_config.json before the window closes"""
+        task, self._config_task = self._config_task, None
+        if task is not None:
+            try:
+                task.future.result(timeout=task.timeout)
+            except Exception as e:
+                logger.error("Error saving settings: %s", e)
+                self._config_dirty = True
+        if self._config_dirty:
+            try:
+                easyini.save_config(self.config_data, self._get_user_config_path())
+            except Exception as e:
+                logger.error("Error saving settings on close: %s", e)
 
     def _get_user_config_path(self):
         """Return a user-writable config path under %APPDATA%/EasyINI/editor_config.json"""
-        base = os.environ.get('APPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming')
-        app_dir = os.path.join(base, 'EasyINI')
-        return os.path.join(app_dir, 'editor_config.json')
+        return easyini.user_config_path()
 
     def refresh_file_list(self):
         """Refresh the files list in config page"""
-        # Clear existing items
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-        
-        # Add files
-        for file_config in self.config_data["files"]:
-            field_count = len(file_config.get("fields", []))
-            self.files_tree.insert("", "end", values=(
-                file_config["name"],
-                file_config["path"],
-                f"{field_count} fields"
-            ))
+        if self.files_tree is not None:
+            # Clear existing items
+            for item in self.files_tree.get_children():
+                self.files_tree.delete(item)
+            
+            # Add files
+            for file_config in self.config_data["files"]:
+                field_count = len(file_config.get("fields", []))
+                self.files_tree.insert("", "end", values=(
+                    file_config["name"],
+                    file_config["path"],
+                    f"{field_count} fields"
+                ))
         
         # Update editor file selector
-        self.file_selector['values'] = [f["name"] for f in self.config_data["files"]]
+        if self.file_selector is not None:
+            self.file_selector['values'] = [f["name"] for f in self.config_data["files"]]
+        self.file_watcher.set_paths([f["path"] for f in self.config_data["files"]])
+        # Parse files and build their views in the background so switching is instant
+        if self.config_data.get("prefetch", True):
+            self.prefetcher.prefetch(self.config_data["files"])
 
     def show_fields_dialog(self, file_config):
         """Show dialog to edit fields for a file"""
@@ -401,11 +966,16 @@ class Editor:
         dialog.transient(self.root)
         dialog.grab_set()
 
-        try:
-            config = configparser.ConfigParser()
-            config.optionxform = str
-            config.read(file_config["path"], encoding='utf-8-sig')
+        def _load_failed(error):
+            if dialog.winfo_exists():
+                messagebox.showerror("Error", f"Could not load INI file: {str(error)}", parent=dialog)
+                dialog.destroy()
 
+        # Validates the file parses, off the Tk thread; served from the shared cache when unchanged
+        self.io.run(self.parse_cache.get, file_config["path"], on_error=_load_failed,
+                    label=f"Checking {file_config['name']}")
+
+        try:
             # ── Main container
             main_frame = ttk.Frame(dialog, padding=15)
             main_frame.pack(fill=tk.BOTH, expand=True)
@@ -464,7 +1034,14 @@ class Editor:
             )
 
             canvas.create_window((0, 0), window=self.scrollable_fields_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
+
+            def on_fields_scrolled(first, last):
+                scrollbar.set(first, last)
+                # Rows are built a page at a time as the end of the built ones comes into view
+                if float(last) > 0.9:
+                    self.schedule_field_rows(self.scrollable_fields_frame)
+
+            canvas.configure(yscrollcommand=on_fields_scrolled)
 
             # Limit height so buttons always visible
             canvas.pack(side="left", fill="both", expand=True)
@@ -483,6 +1060,13 @@ class Editor:
                 style="TButton"
             ).pack(side=tk.LEFT, padx=5)
 
+            ttk.Button(
+                buttons_frame,
+                text="Discover fields",
+                command=lambda: self.show_discovery_dialog(dialog, path_var.get().strip() or file_config["path"]),
+                style="TButton"
+            ).pack(side=tk.LEFT, padx=5)
+
             ttk.Button(
                 buttons_frame,
                 text="Save",
@@ -490,25 +1074,28 @@ class Editor:
                 style="TButton"
             ).pack(side=tk.LEFT, padx=5)
 
-            # Load existing fields
-            for field in file_config.get("fields", []):
-                self.create_field_row(self.scrollable_fields_frame, field)
+            # Existing fields get widgets as they scroll into view; Save reads the rest from their specs
+            self.cancel_field_rows()
+            self.field_entries = list(FileSpec.from_dict(file_config).fields)
+            self.field_rows_built = 0
+            self.build_field_rows(self.scrollable_fields_frame)
+            dialog.bind("<Destroy>", lambda e: self.cancel_field_rows() if e.widget is dialog else None)
 
         except Exception as e:
             messagebox.showerror("Error", f"Could not load INI file: {str(e)}")
             dialog.destroy()
 
-    def create_field_row(self, parent, field_data=None):
+    def create_field_row(self, parent, spec=None):
         """Create a row for field configuration"""
-        if field_data is None:
-            field_data = {"section": "", "option": "", "domain": ""}
+        if spec is None:
+            spec = FieldSpec("", "")
 
         # ── Row container (card-like style)
         row_frame = ttk.Frame(parent, style="Card.TFrame", padding=5)
         row_frame.pack(fill=tk.X, pady=3, padx=5)
 
         # Section Name
-        section_var = tk.StringVar(value=field_data.get("section", ""))
+        section_var = tk.StringVar(value=spec.section)
         section_entry = ttk.Entry(
             row_frame,
             textvariable=section_var,
@@ -517,7 +1104,7 @@ class Editor:
         section_entry.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
 
         # Key
-        option_var = tk.StringVar(value=field_data.get("option", ""))
+        option_var = tk.StringVar(value=spec.option)
         option_entry = ttk.Entry(
             row_frame,
             textvariable=option_var,
@@ -525,7 +1112,7 @@ class Editor:
         )
         option_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
 
-        # Value (CSV) → use Text for multiline
+        # Domain: CSV of allowed values, or a JSON schema object → use Text for multiline
         domain_text = tk.Text(
             row_frame,
             height=2,  # 👈 small text box
@@ -535,61 +1122,242 @@ class Editor:
             bd=1,
             wrap="word"
         )
-        domain_text.insert("1.0", field_data.get("domain", ""))
+        if spec.schema is not None:
+            domain_text.insert("1.0", json.dumps(spec.schema))
+        else:
+            domain_text.insert("1.0", spec.domain)
         domain_text.grid(row=0, column=2, padx=5, pady=5, sticky="ew")
 
+        row = FieldRow(row_frame, section_var, option_var, domain_text, spec.label)
+
         # Remove button
         remove_btn = ttk.Button(
             row_frame,
             text="✕",
-            command=lambda: self.remove_field_row(row_frame),
+            command=lambda: self.remove_field_row(row),
             style="Danger.TButton",
             width=3
         )
         remove_btn.grid(row=0, column=3, padx=5, pady=5)
+        return row
+
+    def show_discovery_dialog(self, parent, ini_path):
+        """List every key of the INI file with checkboxes and add the chosen ones as fields.
+
+        The file is parsed and its values collected on the I/O pool; the
+        dialog opens once that is done. Sections start collapsed and their
+        keys are only inserted when expanded, so files with thousands of keys
+        open instantly. Clicking a section selects or clears all of its keys.
+        """
+        def failed(error):
+            messagebox.showerror("Error", f"Could not load INI file: {str(error)}", parent=parent)
+
+        self.io.run(
+            self._read_discovery,
+            ini_path,
+            on_done=lambda result: self._show_discovery_dialog(parent, *result) if parent.winfo_exists() else None,
+            on_error=failed,
+            label=f"Reading {os.path.basename(ini_path)}"
+        )
 
-        # Helper functions to sync Text widget
-        def get_domain():
-            return domain_text.get("1.0", "end-1c").strip()
+    def _read_discovery(self, ini_path):
+        """Parse ``ini_path`` and collect the values seen per key (I/O thread)"""
+        from easyini.discovery import collect_values
 
-        def set_domain(value):
-            domain_text.delete("1.0", "end")
-            domain_text.insert("1.0", value)
+        _document, config = self.parse_cache.get(ini_path)
+        return config, collect_values(config)
 
-        # Store variables + custom getter/setter
-        row_frame.field_vars = {
-            "section": section_var,
-            "option": option_var,
-            "get_domain": get_domain,
-            "set_domain": set_domain
-        }
+    def _show_discovery_dialog(self, parent, config, observed):
+        from easyini.discovery import describe_suggestion, infer_field
+
+        dialog = tk.Toplevel(parent)
+        dialog.title("Discover Fields")
+        dialog.geometry("700x500")
+        dialog.transient(parent)
+        dialog.grab_set()
+
+        main_frame = ttk.Frame(dialog, padding=15)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(main_frame, text="Tick keys to add as fields; click a section to tick all of its keys").pack(fill=tk.X)
+
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        tree = ttk.Treeview(tree_frame, columns=('Value', 'Suggested'), show='tree headings', selectmode='none')
+        tree.heading('#0', text='Key')
+        tree.heading('Value', text='Value')
+        tree.heading('Suggested', text='Suggested domain')
+        tree.column('#0', width=250, anchor='w')
+        tree.column('Value', width=200, anchor='w')
+        tree.column('Suggested', width=200, anchor='w')
+        tree.tag_configure('configured', foreground='#808080')
+        tree_scroll = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side='right', fill='y')
+        tree.pack(side='left', fill='both', expand=True)
+
+        configured = {entry.key for entry in self.field_entries}
+        selected = set()           # (section, option) pairs ticked so far
+        counts = {}                # section -> number of ticked keys
+        section_items = {}         # section -> tree item
+        item_sections = {}         # tree item -> section
+        item_keys = {}             # tree item -> (section, option), for expanded sections
+        populated = set()          # sections whose keys have been inserted
+
+        def selectable(section):
+            return [option for option in config[section] if (section, option) not in configured]
+
+        def section_text(section):
+            ticked = counts.get(section, 0)
+            if not ticked:
+                mark = "☐"
+            elif ticked == len(selectable(section)):
+                mark = "☑"
+            else:
+                mark = "▣"
+            return f"{mark} {section}"
+
+        def key_text(key):
+            if key in configured:
+                return f"✔ {key[1]}"
+            return f"{'☑' if key in selected else '☐'} {key[1]}"
+
+        def populate(section):
+            item = section_items[section]
+            tree.delete(*tree.get_children(item))
+            values = observed
+            for option, value in config.items(section):
+                key = (section, option)
+                suggestion = describe_suggestion(infer_field(values.get(key, [])))
+                child = tree.insert(item, 'end', text=key_text(key), values=(value, suggestion),
+                                    tags=('configured',) if key in configured else ())
+                item_keys[child] = key
+
+        def set_selected(key, ticked):
+            if ticked and key not in selected:
+                selected.add(key)
+                counts[key[0]] = counts.get(key[0], 0) + 1
+            elif not ticked and key in selected:
+                selected.discard(key)
+                counts[key[0]] -= 1
+
+        def refresh_section(section):
+            item = section_items[section]
+            tree.item(item, text=section_text(section))
+            for child in tree.get_children(item):
+                if child in item_keys:
+                    tree.item(child, text=key_text(item_keys[child]))
+            status.config(text=f"{len(selected)} keys selected")
+
+        def on_click(event):
+            item = tree.identify_row(event.y)
+            if not item or 'indicator' in tree.identify_element(event.x, event.y):
+                return
+            if item in item_keys:
+                key = item_keys[item]
+                if key in configured:
+                    return
+                set_selected(key, key not in selected)
+                refresh_section(key[0])
+            elif item in item_sections:
+                section = item_sections[item]
+                options = selectable(section)
+                tick = counts.get(section, 0) < len(options)
+                for option in options:
+                    set_selected((section, option), tick)
+                refresh_section(section)
+
+        def on_open(event):
+            section = item_sections.get(tree.focus())
+            if section is not None and section not in populated:
+                populated.add(section)
+                populate(section)
+
+        for section in config.sections():
+            item = tree.insert('', 'end', text=section_text(section), open=False)
+            tree.insert(item, 'end', text='…')
+            section_items[section] = item
+            item_sections[item] = section
+        tree.bind('<Button-1>', on_click, add='+')
+        tree.bind('<<TreeviewOpen>>', on_open)
+
+        bottom = ttk.Frame(main_frame)
+        bottom.pack(fill=tk.X)
+        status = ttk.Label(bottom, text="0 keys selected")
+        status.pack(side=tk.LEFT)
+
+        def close():
+            dialog.grab_release()
+            dialog.destroy()
+            parent.grab_set()
+
+        def add_selected():
+            values = observed
+            specs = []
+            for section in config.sections():
+                if not counts.get(section):
+                    continue
+                for option in config[section]:
+                    if (section, option) in selected:
+                        suggestion = infer_field(values.get((section, option), []))
+                        specs.append(FieldSpec(section, option, suggestion.get("domain", ""), suggestion.get("schema")))
+            close()
+            self.add_field_rows(self.scrollable_fields_frame, specs)
+
+        ttk.Button(bottom, text="Cancel", command=close, style="TButton").pack(side=tk.RIGHT, padx=5)
+        ttk.Button(bottom, text="Add selected", command=add_selected, style="TButton").pack(side=tk.RIGHT, padx=5)
+        dialog.protocol("WM_DELETE_WINDOW", close)
+
+    def add_field_rows(self, parent, specs):
+        """Add fields for ``specs``; their rows are built once they scroll into view"""
+        self.field_entries.extend(specs)
+        self.schedule_field_rows(parent)
+
+    def build_field_rows(self, parent, batch=50):
+        """Create widgets for the next ``batch`` fields that have none yet"""
+        self._field_rows_after = None
+        end = min(self.field_rows_built + batch, len(self.field_entries))
+        for i in range(self.field_rows_built, end):
+            self.field_entries[i] = self.create_field_row(parent, self.field_entries[i])
+        self.field_rows_built = end
+
+    def schedule_field_rows(self, parent):
+        """Build the next page of rows once Tk is idle, unless that is already pending"""
+        if self._field_rows_after is None and self.field_rows_built < len(self.field_entries) and parent.winfo_exists():
+            self._field_rows_after = parent.after_idle(lambda: self.build_field_rows(parent))
+
+    def cancel_field_rows(self):
+        """Drop a pending page build, e.g. because the dialog is closing"""
+        if self._field_rows_after is not None:
+            self.root.after_cancel(self._field_rows_after)
+            self._field_rows_after = None
 
     def add_field_row(self, parent):
-        """Add a new field row"""
-        self.create_field_row(parent)
+        """Add a new field row below the rows built so far"""
+        self.field_entries.insert(self.field_rows_built, self.create_field_row(parent))
+        self.field_rows_built += 1
     
-    def remove_field_row(self, row_frame):
+    def remove_field_row(self, row):
         """Remove a field row"""
-        row_frame.destroy()
+        self.field_entries.remove(row)
+        self.field_rows_built -= 1
+        row.frame.destroy()
     
     def save_fields(self, dialog, file_config, path_var=None):
        """Save fields configuration and file path"""
        fields = []
     
-       # Collect all field rows
-       for widget in self.scrollable_fields_frame.winfo_children():
-           if hasattr(widget, "field_vars"):
-               section = widget.field_vars["section"].get().strip()
-               option = widget.field_vars["option"].get().strip()
-               domain = widget.field_vars["get_domain"]().strip()  # 👈 Use getter for Text
-    
-               if section and option:  # Only valid fields
-                   fields.append({
-                       "section": section,
-                       "option": option,
-                       "domain": domain,
-                       "display": f"{section}.{option}"
-                   })
+       # Built rows are read from their widgets, the others straight from their specs
+       for entry in self.field_entries:
+           if isinstance(entry, FieldSpec):
+               fields.append(entry.to_dict())
+               continue
+           try:
+               spec = entry.to_spec()
+           except ValueError as e:
+               messagebox.showerror("Invalid schema", f"{entry.section_var.get()}.{entry.option_var.get()}: {e}", parent=dialog)
+               return
+           if spec is not None:  # Only valid fields
+               fields.append(spec.to_dict())
     
        # Update file config
        file_config["fields"] = fields
@@ -615,8 +1383,6 @@ class Editor:
 
     def create_editor_page(self):
         """Create the editor page with themed ttk widgets"""
-        self.editor_frame = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.editor_frame, text="Editor")
 
         # ── File Selection Card
         file_select_card = ttk.Frame(self.editor_frame, style="Card.TFrame", padding=10)
@@ -632,6 +1398,11 @@ class Editor:
         self.file_selector.bind("<<ComboboxSelected>>", self.on_file_selected)
 
         ttk.Button(select_content, text="Refresh", command=self.refresh_file_list, style="Action.TButton").pack(side=tk.LEFT, padx=10)
+        ttk.Button(select_content, text="Undo", command=self.undo, style="Action.TButton").pack(side=tk.LEFT)
+        ttk.Button(select_content, text="Redo", command=self.redo, style="Action.TButton").pack(side=tk.LEFT, padx=10)
+        self.root.bind_all("<Control-z>", self.on_undo_key)
+        self.root.bind_all("<Control-y>", self.on_redo_key)
+        self.root.bind_all("<Control-Z>", self.on_redo_key)
 
         # ── Main Content Area
         content_frame = ttk.Frame(self.editor_frame)
@@ -641,8 +1412,17 @@ class Editor:
         preview_card = ttk.Frame(content_frame, style="Card.TFrame", padding=5)
         preview_card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
 
+        filter_bar = ttk.Frame(preview_card)
+        filter_bar.pack(fill=tk.X)
+        ttk.Label(filter_bar, text="Filter:").pack(side=tk.LEFT)
+        self.preview_filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_bar, textvariable=self.preview_filter_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        filter_entry.bind("<KeyRelease>", self.on_preview_filter_changed)
+
         preview_canvas_frame = ttk.Frame(preview_card)
         preview_canvas_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.preview_canvas_frame = preview_canvas_frame
         
         self.preview_canvas = tk.Canvas(preview_canvas_frame, highlightthickness=0)
         self.preview_scrollbar = ttk.Scrollbar(preview_canvas_frame, orient="vertical", command=self.preview_canvas.yview)
@@ -659,6 +1439,26 @@ class Editor:
         self.preview_canvas.pack(side="left", fill="both", expand=True)
         self.preview_scrollbar.pack(side="right", fill="y")
 
+        # Single virtualized tree used instead of per-section tables for large files
+        self.preview_tree_frame = ttk.Frame(preview_card)
+        self.preview_tree = ttk.Treeview(self.preview_tree_frame, columns=('Value',), show='tree headings')
+        self.preview_tree.heading('#0', text='Key')
+        self.preview_tree.heading('Value', text='Value')
+        self.preview_tree.column('#0', width=250, anchor='w', stretch=False)
+        self.preview_tree.column('Value', width=600, anchor='w', stretch=False)
+        self.preview_tree.tag_configure('highlight', background="#75a3db", foreground="black")
+        self.preview_tree.tag_configure('section', font=('Arial', 10, 'bold'))
+        tree_vscroll = ttk.Scrollbar(self.preview_tree_frame, orient='vertical', command=self.preview_tree.yview)
+        tree_hscroll = ttk.Scrollbar(self.preview_tree_frame, orient='horizontal', command=self.preview_tree.xview)
+        self.preview_tree.configure(yscrollcommand=tree_vscroll.set, xscrollcommand=tree_hscroll.set)
+        tree_vscroll.pack(side='right', fill='y')
+        tree_hscroll.pack(side='bottom', fill='x')
+        self.preview_tree.pack(side='left', fill='both', expand=True)
+        self.preview_tree.bind('<<TreeviewOpen>>', self._on_preview_tree_open)
+        self.preview_tree.bind('<<TreeviewClose>>', self._on_preview_tree_close)
+        self.preview_tree.bind('<Motion>', self._on_preview_tree_motion)
+        self.preview_tree.bind('<Leave>', lambda e: self.preview_status.config(text="Changes are saved automatically"))
+
         # ── Right Panel: Editor
         editor_card = ttk.Frame(content_frame, style="Card.TFrame", padding=5)
         editor_card.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
@@ -670,16 +1470,10 @@ class Editor:
 
         self.editor_canvas = tk.Canvas(editor_canvas_frame, highlightthickness=0)
         self.editor_scrollbar = ttk.Scrollbar(editor_canvas_frame, orient="vertical", command=self.editor_canvas.yview)
-        self.editor_scrollable_frame = ttk.Frame(self.editor_canvas)
-
-        self.editor_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.editor_canvas.configure(scrollregion=self.editor_canvas.bbox("all"))
+        self.editor_list = VirtualFieldList(
+            self.editor_canvas, self.editor_scrollbar, self.on_editor_field_changed, self.on_editor_field_invalid
         )
 
-        self.editor_canvas.create_window((0, 0), window=self.editor_scrollable_frame, anchor="nw")
-        self.editor_canvas.configure(yscrollcommand=self.editor_scrollbar.set)
-
         self.editor_canvas.pack(side="left", fill="both", expand=True)
         self.editor_scrollbar.pack(side="right", fill="y")
 
@@ -716,125 +1510,164 @@ class Editor:
         
         try:
             # Update values from editor fields
-            for widget in self.editor_scrollable_frame.winfo_children():
-                if hasattr(widget, 'field_data'):
-                    section = widget.field_data["section"]
-                    option = widget.field_data["option"]
-                    new_value = widget.field_data["value_var"].get()
-                    
-                    if section in self.current_ini_data:
-                        self.current_ini_data[section][option] = new_value
+            for spec, value in zip(self.editor_fields.specs, self.editor_fields.values):
+                section, option = spec.key
+                if section in self.current_ini_data:
+                    self.current_ini_data[section][option] = value
+                    # Only keys whose value changed are patched on disk
+                    if self.current_document.get(section, option) != value:
+                        self._journal_edit(section, option, value)
+                        self.current_document.set(section, option, value)
+                        self._local_edits[(section, option)] = value
             
             # Write to INI file at actual selected path (not alongside exe)
             ini_path = self.current_file["path"]
-            if not os.path.exists(ini_path):
-                messagebox.showwarning("Warning", f"File not found at {ini_path}. Changes were not saved.")
-                return
-            with open(ini_path, 'w') as f:
-                self.current_ini_data.write(f)
-            
-            # Refresh preview
-            self.load_ini_file(self.current_file)
-            
-          
-            messagebox.showinfo("Success", "Changes saved successfully")
-            
+            self.save_scheduler.schedule(ini_path, self.current_document)
+            self.save_scheduler.commit()
         except Exception as e:
-            # logging.info(f"Could not save file: {str(e)}")
             messagebox.showerror("Error", f"Could not save file: {str(e)}")
+            return
+
+        # Wait for the writer off the Tk thread; a missing file is reported by the write itself
+        self.io.run(
+            self.writer.flush,
+            on_done=lambda _result: self._on_changes_saved(),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not save file: {str(e)}"),
+            label=f"Saving {os.path.basename(ini_path)}"
+        )
+
+    def _on_changes_saved(self):
+        self.update_preview_display()
+        messagebox.showinfo("Success", "Changes saved successfully")
 
     def load_ini_file(self, file_config):
-        """Load and display INI file"""
+        """Load and display INI file.
+
+        Reading and parsing run on the I/O pool; the editor and preview are
+        filled in by ``_show_ini_file`` once the file arrives.
+        """
+        # Send the previous file's pending edits on their way before switching
+        self.save_scheduler.commit()
+        self._local_edits.clear()
+        if self._load_task is not None:
+            # A newer selection wins over a load still in flight
+            self._load_task.cancel()
+        if self.current_file is None or self.current_file.get("path") != file_config.get("path"):
+            # Undo steps belong to the file they were made in
+            self.history.clear()
+        self.current_file = file_config
+        # Edits made while the file loads would land in the previous file's data
+        self.current_ini_data = None
+        self.current_document = None
+        ini_path = file_config.get("path", "")
+        self.prefetcher.activate(ini_path)
+        self._load_task = self.io.run(
+            self._read_ini_file,
+            ini_path,
+            list(file_config.get("fields", [])),
+            on_done=lambda result: self._show_ini_file(file_config, result),
+            on_error=lambda e: self._on_load_failed(file_config, e),
+            label=f"Loading {file_config.get('name', os.path.basename(ini_path))}"
+        )
+
+    def _read_ini_file(self, ini_path, fields):
+        """Parse ``ini_path`` and build its view model (I/O thread); None when missing"""
         try:
-            self.current_file = file_config
-            config = configparser.ConfigParser()
-            # Preserve original key case
-            config.optionxform = str
-            ini_path = file_config.get("path", "")
-            if not os.path.exists(ini_path):
-                self.current_ini_data = None
-                messagebox.showwarning("Warning", f"File not found at {ini_path}")
-                return
-            config.read(ini_path, encoding="utf-8-sig")
-            
+            # Our own pending writes to this file land before it is read
+            self.writer.flush()
+        except Exception as e:
+            logger.error("Error saving pending changes: %s", e)
+        if not os.path.exists(ini_path):
+            return None
+        # The document keeps the raw lines for lossless saves; ConfigParser backs the views.
+        # Both are this editor's own copies, so edits never leak into the cache.
+        return self.prefetcher.view_model(ini_path, fields)
+
+    def _show_ini_file(self, file_config, result):
+        """Display a file read by ``_read_ini_file`` (Tk thread)"""
+        self._load_task = None
+        if file_config is not self.current_file:
+            return
+        if result is None:
+            messagebox.showwarning("Warning", f"File not found at {file_config.get('path', '')}")
+            return
+        try:
+            model = result
+
             # Store current data
-            self.current_ini_data = config
-            # for i in config:
-                # print(i)
+            self.current_ini_data = model["config"]
+            self.current_document = model["document"]
+            self.search_index = model["search_index"]
+            self.editor_fields = model["field_table"]
             
             # Update preview display
-            self.update_preview_display()
+            self.update_preview_display(rebuild=True)
             
             # Create editor fields
             self.create_editor_fields(file_config)
 
+            # Parse a deferred document or copy the cache's shared objects now,
+            # so the first edit does not do it on the Tk thread
+            self.io.run(self._preload, self.current_document, self.current_ini_data,
+                        label="Preparing file for editing")
+
         except Exception as e:
             messagebox.showerror("Error", f"Could not load INI file: {str(e)}")
 
+    @staticmethod
+    def _preload(document, config):
+        """Give ``document`` and ``config`` their own data before they are edited (I/O thread)"""
+        document.preload()
+        if hasattr(config, "preload"):
+            config.preload()
+
+    def _on_load_failed(self, file_config, error):
+        self._load_task = None
+        if file_config is self.current_file:
+            messagebox.showerror("Error", f"Could not load INI file: {str(error)}")
+
+    def on_io_busy(self, labels):
+        """Show that file I/O is in progress instead of a frozen window"""
+        self.root.config(cursor="watch" if labels else "")
+        status = getattr(self, "preview_status", None)
+        if status is None:
+            return
+        if labels:
+            status.config(text=f"{labels[0]}…", fg="#ffd54f")
+        else:
+            status.config(text="Changes are saved automatically", fg="#e4e4e4")
+
     def create_editor_fields(self, file_config):
         """Create editor fields based on configuration"""
-        # Clear existing fields
-        for widget in self.editor_scrollable_frame.winfo_children():
-            widget.destroy()
+        with metrics.timer("field_build"):
+            self._build_editor_fields(file_config)
+
+    def _build_editor_fields(self, file_config):
+        field_table, self.editor_fields = self.editor_fields, FieldTable()
         
         if not self.current_ini_data:
+            self.editor_list.set_fields(self.editor_fields)
             return
         
-        # Create fields for each configured field
-        for field_config in file_config.get("fields", []):
-            section = field_config["section"]
-            option = field_config["option"]
-            display = field_config["display"]
-            domain = field_config["domain"]
-            
-            # Get current value, create section if it doesn't exist
-            current_value = ""
+        # The field table comes with the view model prebuilt by the prefetcher; rows are materialized as they scroll into view
+        self.editor_fields = field_table
+        for section, _option in self.editor_fields.keys():
+            # Create sections that don't exist yet so edits have somewhere to go
             if section not in self.current_ini_data:
                 self.current_ini_data.add_section(section)
-            elif option in self.current_ini_data[section]:
-                current_value = self.current_ini_data[section][option]
-            
-            # Create field frame with minimal styling
-            field_frame = tk.Frame(self.editor_scrollable_frame)
-            field_frame.pack(fill=tk.X, pady=3, padx=5)
-            
-            # Field label
-            label_frame = tk.Frame(field_frame, height=25, width=40)
-            label_frame.pack(fill=tk.X, expand=True)
-            label_frame.pack_propagate(False)
-            
-            tk.Label(label_frame, 
-                    text=f"{display or f'{section}.{option}'}", 
-                    font=('Arial', 9, 'bold'),
-                    fg="#FFFFFF").pack(side=tk.LEFT, padx=8, pady=3)
-            
-            # Value input frame
-            input_frame = tk.Frame(field_frame, padx=8, pady=8)
-            input_frame.pack(fill=tk.X)
-            
-            # Value input
-            if domain and not (section == "DECODE" and option.upper() == "CALIBRATION"): 
-                # Dropdown for predefined values 
-                values = [v.strip() for v in domain.split(",")] 
-                value_var = tk.StringVar(value=current_value) 
-                value_combo = ttk.Combobox(input_frame, textvariable=value_var, values=values, state="readonly", font=('Arial', 9), width=40) 
-                value_combo.pack(fill=tk.X, pady=2, expand=True) 
-                # Bind for live preview 
-                value_combo.bind("<<ComboboxSelected>>", lambda e, var=value_var, s=section, o=option: self.update_live_preview(var, s, o)) 
-            else: 
-                # Textbox (for DECODE.CALIBRATION or when no domain is provided) 
-                value_var = tk.StringVar(value=current_value) 
-                value_entry = tk.Entry(input_frame, textvariable=value_var, font=('Arial', 9), width=40) 
-                value_entry.pack(fill=tk.X, pady=2, expand=True) 
-                # Bind for live preview on text change 
-                value_entry.bind("<KeyRelease>", lambda e, var=value_var, s=section, o=option: self.update_live_preview(var, s, o))
-                # Store reference for saving
-            field_frame.field_data = {
-                "section": section,
-                "option": option,
-                "value_var": value_var
-            }
+        
+        self.editor_list.set_fields(self.editor_fields)
+    
+    def on_editor_field_changed(self, index, value_var):
+        """Route an edit from a recycled row to the live preview"""
+        section, option = self.editor_fields.specs[index].key
+        self.update_live_preview(value_var, section, option)
     
+    def on_editor_field_invalid(self, index, error):
+        """Explain why a keystroke was not applied or saved"""
+        display = self.editor_fields.specs[index].display
+        self.preview_status.config(text=f"Not saved: {display}: {error}", fg="#ff4d4d")
+
     def update_live_preview(self, value_var, section, option):
         """Update live preview when field values change"""
         if not self.current_ini_data:
@@ -842,119 +1675,518 @@ class Editor:
             
         try:
             new_value = value_var.get()
+            old_value = self.current_document.get(section, option)
+            if new_value == old_value:
+                # Focus changes and programmatic sets re-send the stored value
+                return
             
             # Create section if it doesn't exist
             if section not in self.current_ini_data:
                 self.current_ini_data.add_section(section)
             
-            # Update the in-memory data
+            # Update the in-memory data; ConfigParser rejects values such as a lone %
             self.current_ini_data[section][option] = new_value
-            
-            # Update the preview text
-            self.update_preview_display()
+            self.current_document.set(section, option, new_value)
+            self._local_edits[(section, option)] = new_value
 
-            # Persist immediately for durability
+            # Only an edit both models accepted is journaled and can be undone
             if self.current_file and 'path' in self.current_file:
-                ini_path = self.current_file['path']
-                if os.path.exists(ini_path):
-                    with open(ini_path, 'w') as f:
-                        self.current_ini_data.write(f)
-                else:
-                    messagebox.showwarning("Warning", f"File not found at {ini_path}. Changes were not saved.")
-                    # Avoid flipping status to green when not saved
-                    self.preview_status.config(text="File not found; changes not saved", fg="#ff4d4d")
-                    self.root.after(2000, lambda: self.preview_status.config(text="Changes are saved automatically", fg='#e4e4e4'))
+                self.history.record(self.current_file['path'], section, option, old_value, new_value)
+            self._journal_edit(section, option, new_value)
             
-            # Update status
-            self.preview_status.config(text="File saved", fg="#1fff23")
-            
-            # Reset status after 2 seconds
-            self.root.after(2000, lambda: self.preview_status.config(text="Changes are saved automatically", fg='#e4e4e4'))
+            # Update just the edited row in the preview
+            self.update_preview_value(section, option)
+
+            # Persist once typing pauses; the scheduler reports progress
+            if self.current_file and 'path' in self.current_file:
+                self.save_scheduler.schedule(self.current_file['path'], self.current_document)
             
         except Exception as e:
-            print(f"Error updating live preview: {e}")
+            logger.exception("Error updating live preview: %s", e)
     
-    def update_preview_display(self):
-        """Render a non-editable preview as tables per section (Key/Value)."""
+    def on_undo_key(self, event):
+        if self._history_shortcuts_active(event):
+            self.undo()
+            return "break"
+
+    def on_redo_key(self, event):
+        if self._history_shortcuts_active(event):
+            self.redo()
+            return "break"
+
+    def _history_shortcuts_active(self, event):
+        # Only the editor page of the main window; dialogs keep their own keys
+        widget = event.widget
+        if not hasattr(widget, "winfo_toplevel") or widget.winfo_toplevel() is not self.root:
+            return False
+        return self.notebook.select() == str(self.editor_frame)
+
+    def undo(self):
+        """Revert the last edit to a field"""
+        self._apply_history_step(self.history.undo(), "Nothing to undo")
+
+    def redo(self):
+        """Re-apply the last undone edit"""
+        self._apply_history_step(self.history.redo(), "Nothing to redo")
+
+    def _apply_history_step(self, step, empty_message):
+        if step is None or not self.current_file or not self.current_ini_data:
+            self.preview_status.config(text=empty_message, fg="#e4e4e4")
+            return
+        path, section, option, value = step
+        if ParseCache._normalize(path) != ParseCache._normalize(self.current_file.get("path", "")):
+            return
+
+        # Only this key's lines change in the document; the save then rewrites the
+        # file atomically through the normal autosave path, like any other edit
+        self._journal_edit(section, option, value)
+        if value is None:
+            self.current_document.remove(section, option)
+            if self.current_ini_data.has_section(section):
+                self.current_ini_data[section].pop(option, None)
+            self.search_index.remove(section, option)
+            self._local_edits.pop((section, option), None)
+            self.update_preview_display()
+        else:
+            if not self.current_ini_data.has_section(section):
+                self.current_ini_data.add_section(section)
+            self.current_ini_data[section][option] = value
+            self.current_document.set(section, option, value)
+            self._local_edits[(section, option)] = value
+            self.update_preview_value(section, option)
+
+        self.editor_fields.set_value(section, option, value if value is not None else "")
+        self.editor_list.refresh()
+        self.save_scheduler.schedule(path, self.current_document)
+
+    def on_external_change(self, path):
+        """Watcher callback: parse a file another program changed (worker thread)"""
+        if self.parse_cache.is_fresh(path):
+            # Our own autosave; the scheduler already re-keyed the cache
+            return
+        document, config = self.parse_cache.get(path)
+        if self.writer.wrote(path, document.synced_digest()):
+            # Also our own autosave, seen before the writer re-keyed the cache
+            return
+        # merge_external_change edits them on the Tk thread
+        self._preload(document, config)
+        with self._external_lock:
+            self._external_changes.append((path, document, config))
+
+    def apply_external_changes(self):
+        """Merge files parsed by the watcher into the open editor (Tk thread)"""
+        with self._external_lock:
+            changes, self._external_changes = self._external_changes, []
+        for path, document, config in changes:
+            try:
+                self.merge_external_change(path, document, config)
+            except Exception as e:
+                logger.exception("Error merging external changes to %s: %s", path, e)
+        self.root.after(250, self.apply_external_changes)
+
+    def merge_external_change(self, path, document, config):
+        """Adopt freshly parsed data for the current file, touching only changed keys"""
+        if not self.current_file or not self.current_ini_data:
+            return
+        if ParseCache._normalize(self.current_file.get("path", "")) != ParseCache._normalize(path):
+            return
+
+        # Re-apply edits the disk has not seen yet on top of the other program's version
+        for (section, option), value in self._local_edits.items():
+            if not config.has_section(section):
+                config.add_section(section)
+            config[section][option] = value
+            document.set(section, option, value)
+        for section, _option in self.editor_fields.keys():
+            if not config.has_section(section):
+                config.add_section(section)
+
+        self.current_document = document
+        self.current_ini_data = config
+
+        if self.editor_fields.sync(config):
+            self.editor_list.refresh()
+        self.update_preview_display()
+
+        if self._local_edits:
+            self.save_scheduler.schedule(path, document)
+        else:
+            self.preview_status.config(text="Reloaded changes made by another program", fg="#4fc3f7")
+
+    def on_save_state(self, state, detail=None):
+        """Reflect autosave progress in the status bar"""
+        if self._status_reset_id is not None:
+            self.root.after_cancel(self._status_reset_id)
+            self._status_reset_id = None
+        if state == "pending":
+            self.preview_status.config(text="Unsaved changes pending…", fg="#ffd54f")
+            return
+        if state == "flushed":
+            self._local_edits.clear()
+        if state == "error":
+            self.preview_status.config(text=f"Changes not saved: {detail}", fg="#ff4d4d")
+        else:
+            self.preview_status.config(text="File saved", fg="#1fff23")
+        # Reset status after 2 seconds
+        self._status_reset_id = self.root.after(
+            2000,
+            lambda: self.preview_status.config(text="Changes are saved automatically", fg='#e4e4e4')
+        )
+
+    def update_preview_display(self, rebuild=False):
+        """Render a non-editable preview as tables per section (Key/Value).
+
+        With ``rebuild`` the tables are recreated from scratch (used when a
+        file is loaded). Otherwise the existing tables are kept and only rows
+        or sections whose contents changed are touched.
+        """
         if not self.current_ini_data:
             return
 
-        # Clear existing tables
+        try:
+            with metrics.timer("render"):
+                # On load the index comes prebuilt with the file's view model
+                if not rebuild and self.preview_sections is not None:
+                    self.search_index.sync(self.current_ini_data)
+                if self.preview_query:
+                    self._render_preview_filter()
+                elif rebuild or self.preview_sections is None or self.preview_filtered:
+                    self._rebuild_preview_widgets()
+                elif self.preview_mode == "tree":
+                    self._sync_preview_tree()
+                else:
+                    self._sync_preview()
+        except Exception as e:
+            logger.exception("Error updating preview display: %s", e)
+
+    def _rebuild_preview_widgets(self):
+        self.preview_filtered = False
+        self._set_preview_mode(self._choose_preview_mode())
+        if self.preview_mode == "tree":
+            self._rebuild_preview_tree()
+        else:
+            self._rebuild_preview()
+
+    def update_preview_value(self, section, option):
+        """Refresh the preview row for a single key, adding it if needed"""
+        value = self.current_ini_data[section][option]
+        self.search_index.update(section, option, value)
+        row = self.preview_rows.get((section, option)) if self.preview_rows is not None else None
+        if row is None:
+            if self.preview_filtered and not self.search_index.matches(self.preview_query, section, option):
+                return
+            if self.preview_mode == "tree" and section in self.preview_sections and section not in self.preview_populated:
+                # Collapsed section: rows are created from current data when expanded
+                return
+            self.update_preview_display()
+            return
+        tree, item = row
+        if tree.set(item, 'Value') != value:
+            tree.set(item, 'Value', value)
+
+    def _choose_preview_mode(self):
+        """Pick between per-section tables and the single virtualized tree"""
+        mode = self.config_data.get("preview_mode", "auto")
+        if mode in ("tables", "tree"):
+            return mode
+        if self._preview_is_lazy():
+            # Tables would materialize every section up front
+            return "tree"
+        threshold = self.config_data.get("preview_tree_threshold", 100)
+        return "tree" if len(self.current_ini_data.sections()) > threshold else "tables"
+
+    def _preview_is_lazy(self):
+        return getattr(self.current_ini_data, "lazy", False)
+
+    def _set_preview_mode(self, mode):
+        if mode == self.preview_mode:
+            return
+        if mode == "tree":
+            self.preview_canvas_frame.pack_forget()
+            self.preview_tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        else:
+            self.preview_tree_frame.pack_forget()
+            self.preview_canvas_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.preview_mode = mode
+
+    def _rebuild_preview_tree(self):
+        # Release anything left over from the table view
         for widget in self.preview_tables_frame.winfo_children():
             widget.destroy()
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_sections = {}
+        self.preview_rows = {}
+        self.preview_populated = set()
+        self.preview_tree_items = {}
+
+        for section in self.current_ini_data.sections():
+            self._insert_preview_tree_section(section)
+
+    def _insert_preview_tree_section(self, section):
+        """Add a collapsed section node; its rows are created when expanded"""
+        item = self.preview_tree.insert('', 'end', text=section, open=False, tags=('section',))
+        # Lazy sections always get a placeholder so collapsed ones stay unparsed
+        if self._preview_is_lazy() or len(self.current_ini_data[section]):
+            self.preview_tree.insert(item, 'end', text='…')
+        self.preview_sections[section] = item
+        self.preview_tree_items[item] = section
+
+    def _populate_preview_tree_section(self, section):
+        item = self.preview_sections[section]
+        self.preview_tree.delete(*self.preview_tree.get_children(item))
+        configured_fields = self._configured_preview_fields()
+        for option, value in self.current_ini_data.items(section):
+            self._insert_preview_tree_row(section, option, value, configured_fields)
+            # Lazy sections become searchable once they have been parsed
+            self.search_index.update(section, option, value)
+        self.preview_populated.add(section)
+
+    def _depopulate_preview_tree_section(self, section):
+        item = self.preview_sections[section]
+        children = self.preview_tree.get_children(item)
+        if children:
+            self.preview_tree.delete(*children)
+            self.preview_tree.insert(item, 'end', text='…')
+        for key in [k for k in self.preview_rows if k[0] == section]:
+            del self.preview_rows[key]
+        self.preview_populated.discard(section)
+
+    def _insert_preview_tree_row(self, section, option, value, configured_fields):
+        tag = ()
+        if (section, option) in configured_fields:
+            tag = ('highlight',)
+        item = self.preview_tree.insert(self.preview_sections[section], 'end', text=option, values=(value,), tags=tag)
+        self.preview_rows[(section, option)] = (self.preview_tree, item)
+
+    def _sync_preview_tree(self):
+        configured_fields = self._configured_preview_fields()
+
+        for section in list(self.preview_sections):
+            if not self.current_ini_data.has_section(section):
+                item = self.preview_sections.pop(section)
+                del self.preview_tree_items[item]
+                self.preview_tree.delete(item)
+                self.preview_populated.discard(section)
+                for key in [k for k in self.preview_rows if k[0] == section]:
+                    del self.preview_rows[key]
+
+        for section in self.current_ini_data.sections():
+            if section not in self.preview_sections:
+                self._insert_preview_tree_section(section)
+                continue
+            if section not in self.preview_populated:
+                # Placeholder keeps collapsed sections expandable when they gain keys
+                item = self.preview_sections[section]
+                if not self.preview_tree.get_children(item) and (
+                        self._preview_is_lazy() or len(self.current_ini_data[section])):
+                    self.preview_tree.insert(item, 'end', text='…')
+                continue
+
+            present = set()
+            for option, value in self.current_ini_data.items(section):
+                present.add(option)
+                row = self.preview_rows.get((section, option))
+                if row is None:
+                    self._insert_preview_tree_row(section, option, value, configured_fields)
+                elif self.preview_tree.set(row[1], 'Value') != value:
+                    self.preview_tree.set(row[1], 'Value', value)
+            for key in [k for k in self.preview_rows if k[0] == section and k[1] not in present]:
+                self.preview_tree.delete(self.preview_rows.pop(key)[1])
+
+    def _on_preview_tree_open(self, event):
+        if self.preview_filtered:
+            return
+        section = self.preview_tree_items.get(self.preview_tree.focus())
+        if section is not None and section not in self.preview_populated:
+            self._populate_preview_tree_section(section)
 
+    def _on_preview_tree_close(self, event):
+        # Collapsed sections give their rows back so memory tracks what is visible
+        if self.preview_filtered:
+            return
+        section = self.preview_tree_items.get(self.preview_tree.focus())
+        if section is not None and section in self.preview_populated:
+            self._depopulate_preview_tree_section(section)
+
+    def _on_preview_tree_motion(self, event):
+        row_id = self.preview_tree.identify_row(event.y)
+        if not row_id or row_id in self.preview_tree_items or not self.preview_tree.parent(row_id):
+            self.preview_status.config(text="Changes are saved automatically")
+            return
+        values = self.preview_tree.item(row_id, 'values')
+        key_text = self.preview_tree.item(row_id, 'text')
+        value_text = str(values[0]) if values else ""
+        self.preview_status.config(text=f"{key_text} = {value_text}")
+
+    def on_preview_filter_changed(self, event=None):
+        """Filter the preview by the query typed into the filter box"""
+        query = self.preview_filter_var.get().strip()
+        if query == self.preview_query:
+            return
+        self.preview_query = query
+        if not self.current_ini_data:
+            return
+        # The index is already current, so a keystroke only costs the lookup and redraw
         try:
-            # Build set of configured editable fields to highlight
-            configured_fields = set()
-            if self.current_file and isinstance(self.current_file, dict):
-                for f in self.current_file.get('fields', []):
-                    configured_fields.add((f.get('section', ''), f.get('option', '')))
-            print(configured_fields)
-            for section in self.current_ini_data.sections():
-                # Section header
-                header = tk.Frame(self.preview_tables_frame, bg="#1a1a1a")
-                header.pack(fill=tk.X, pady=(0, 4))
-                tk.Label(header, text=section, font=('Arial', 10, 'bold'), bg='#15141d', fg="#FFFFFF").pack(anchor='w')
-
-                # Table
-                table_frame = tk.Frame(self.preview_tables_frame, bg='white')
-                table_frame.pack(fill=tk.X, pady=(0, 10))
-
-                columns = ('Key', 'Value')
-                tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=6)
-                tree.heading('Key', text='Key')
-                tree.heading('Value', text='Value')
-                # Disable stretch so horizontal scrollbar becomes effective
-                tree.column('Key', width=200, anchor='w', stretch=False)
-                tree.column('Value', width=600, anchor='w', stretch=False)
-
-                # Minimal style - strip editing; Treeview is read-only by default
-                # Configure highlight tag for fields present in config
-                tree.tag_configure('highlight', background="#75a3db", foreground="black")  # subtle highlight
-
-                for option, value in self.current_ini_data.items(section):
-                    tag = ()
-                    if (section, option) in configured_fields:
-                        tag = ('highlight',)
-                    # print(option, value)
-                    tree.insert('', 'end', values=(option, value), tags=tag)
-
-                # Scrollbars for table (horizontal and vertical)
-                vscroll = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-                hscroll = ttk.Scrollbar(table_frame, orient='horizontal', command=tree.xview)
-                tree.configure(yscrollcommand=vscroll.set, xscrollcommand=hscroll.set)
-
-                # Layout
-                tree.pack(side='left', fill='both', expand=True)
-                vscroll.pack(side='right', fill='y')
-                hscroll.pack(side='bottom', fill='x')
-
-                # Hover status updater at bottom (shows full key/value)
-                def _on_tree_motion(event, _tree=tree):
-                    row_id = _tree.identify_row(event.y)
-                    if not row_id:
-                        self.preview_status.config(text="Changes are saved automatically")
-                        return
-                    values = _tree.item(row_id, 'values')
-                    if not values:
-                        self.preview_status.config(text="Changes are saved automatically")
-                        return
-                    key_text = str(values[0]) if len(values) > 0 else ""
-                    value_text = str(values[1]) if len(values) > 1 else ""
-                    self.preview_status.config(text=f"{key_text} = {value_text}")
-
-                def _on_tree_leave(event):
-                    self.preview_status.config(text="Changes are saved automatically")
-
-                tree.bind('<Motion>', _on_tree_motion)
-                tree.bind('<Leave>', _on_tree_leave)
-
+            with metrics.timer("render"):
+                if query:
+                    self._render_preview_filter()
+                else:
+                    self._rebuild_preview_widgets()
         except Exception as e:
-            print(f"Error updating preview display: {e}")
+            logger.exception("Error filtering preview: %s", e)
 
-import os, sys, subprocess
+    def _render_preview_filter(self):
+        """Show only the rows matching the filter query in the tree view"""
+        self._set_preview_mode("tree")
+        for widget in self.preview_tables_frame.winfo_children():
+            widget.destroy()
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_sections = {}
+        self.preview_rows = {}
+        self.preview_populated = set()
+        self.preview_tree_items = {}
+        self.preview_filtered = True
+
+        configured_fields = self._configured_preview_fields()
+        limit = self.config_data.get("preview_filter_limit", 2000)
+        shown = 0
+        for section, options in self.search_index.search(self.preview_query):
+            if shown >= limit:
+                break
+            item = self.preview_tree.insert('', 'end', text=section, open=True, tags=('section',))
+            self.preview_sections[section] = item
+            self.preview_tree_items[item] = section
+            self.preview_populated.add(section)
+            values = self.current_ini_data[section]
+            for option in options if options is not None else list(values):
+                if shown >= limit:
+                    break
+                self._insert_preview_tree_row(section, option, values[option], configured_fields)
+                shown += 1
+
+        if shown >= limit:
+            self.preview_status.config(text=f"Showing the first {limit} matches; refine the filter to see more")
+        else:
+            self.preview_status.config(text=f"{shown} matching keys")
+
+    def _configured_preview_fields(self):
+        """Return the (section, option) pairs to highlight in the preview"""
+        return self.editor_fields.keys()
+
+    def _rebuild_preview(self):
+        # Clear existing tables
+        for widget in self.preview_tables_frame.winfo_children():
+            widget.destroy()
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_sections = {}
+        self.preview_rows = {}
+
+        # Build set of configured editable fields to highlight
+        configured_fields = self._configured_preview_fields()
+        for section in self.current_ini_data.sections():
+            self._create_preview_section(section, configured_fields)
+
+    def _sync_preview(self):
+        configured_fields = self._configured_preview_fields()
+        sections = self.current_ini_data.sections()
+
+        # Drop tables for sections that no longer exist
+        for section in list(self.preview_sections):
+            if not self.current_ini_data.has_section(section):
+                header, table_frame, _tree = self.preview_sections.pop(section)
+                header.destroy()
+                table_frame.destroy()
+                for key in [k for k in self.preview_rows if k[0] == section]:
+                    del self.preview_rows[key]
+
+        for section in sections:
+            if section not in self.preview_sections:
+                self._create_preview_section(section, configured_fields)
+                continue
+
+            tree = self.preview_sections[section][2]
+            items = self.current_ini_data.items(section)
+            present = set()
+            for option, value in items:
+                present.add(option)
+                row = self.preview_rows.get((section, option))
+                if row is None:
+                    self._insert_preview_row(tree, section, option, value, configured_fields)
+                elif tree.set(row[1], 'Value') != value:
+                    tree.set(row[1], 'Value', value)
+
+            if len(present) != len(tree.get_children()):
+                for key in [k for k in self.preview_rows if k[0] == section and k[1] not in present]:
+                    tree.delete(self.preview_rows.pop(key)[1])
+
+    def _insert_preview_row(self, tree, section, option, value, configured_fields):
+        tag = ()
+        if (section, option) in configured_fields:
+            tag = ('highlight',)
+        item = tree.insert('', 'end', values=(option, value), tags=tag)
+        self.preview_rows[(section, option)] = (tree, item)
+
+    def _create_preview_section(self, section, configured_fields):
+        # Section header
+        header = tk.Frame(self.preview_tables_frame, bg="#1a1a1a")
+        header.pack(fill=tk.X, pady=(0, 4))
+        tk.Label(header, text=section, font=('Arial', 10, 'bold'), bg='#15141d', fg="#FFFFFF").pack(anchor='w')
+
+        # Table
+        table_frame = tk.Frame(self.preview_tables_frame, bg='white')
+        table_frame.pack(fill=tk.X, pady=(0, 10))
+
+        columns = ('Key', 'Value')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=6)
+        tree.heading('Key', text='Key')
+        tree.heading('Value', text='Value')
+        # Disable stretch so horizontal scrollbar becomes effective
+        tree.column('Key', width=200, anchor='w', stretch=False)
+        tree.column('Value', width=600, anchor='w', stretch=False)
+
+        # Minimal style - strip editing; Treeview is read-only by default
+        # Configure highlight tag for fields present in config
+        tree.tag_configure('highlight', background="#75a3db", foreground="black")  # subtle highlight
+
+        for option, value in self.current_ini_data.items(section):
+            self._insert_preview_row(tree, section, option, value, configured_fields)
+
+        # Scrollbars for table (horizontal and vertical)
+        vscroll = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        hscroll = ttk.Scrollbar(table_frame, orient='horizontal', command=tree.xview)
+        tree.configure(yscrollcommand=vscroll.set, xscrollcommand=hscroll.set)
+
+        # Layout
+        tree.pack(side='left', fill='both', expand=True)
+        vscroll.pack(side='right', fill='y')
+        hscroll.pack(side='bottom', fill='x')
+
+        # Hover status updater at bottom (shows full key/value)
+        def _on_tree_motion(event, _tree=tree):
+            row_id = _tree.identify_row(event.y)
+            if not row_id:
+                self.preview_status.config(text="Changes are saved automatically")
+                return
+            values = _tree.item(row_id, 'values')
+            if not values:
+                self.preview_status.config(text="Changes are saved automatically")
+                return
+            key_text = str(values[0]) if len(values) > 0 else ""
+            value_text = str(values[1]) if len(values) > 1 else ""
+            self.preview_status.config(text=f"{key_text} = {value_text}")
+
+        def _on_tree_leave(event):
+            self.preview_status.config(text="Changes are saved automatically")
+
+        tree.bind('<Motion>', _on_tree_motion)
+        tree.bind('<Leave>', _on_tree_leave)
+
+        self.preview_sections[section] = (header, table_frame, tree)
 
 def launch_exe(exe_name):
+    import subprocess
+
     # Get the folder where the main exe is running from
     base_path = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else __file__)
     exe_path = os.path.join(base_path, exe_name)
@@ -964,23 +2196,38 @@ def launch_exe(exe_name):
     except Exception as e:
         print(f"Error launching {exe_name}: {e}")
 
-def resource_path(filename):
-    """Get absolute path to resource (works for dev and for PyInstaller exe)"""
-    if hasattr(sys, '_MEIPASS'):
-        # When running as PyInstaller bundle
-        base_path = sys._MEIPASS
-    else:
-        # When running from source or installed exe
-        base_path = os.path.dirname(os.path.abspath(sys.argv[0]))
-    return os.path.join(base_path, filename)
+def apply_theme(root, profile):
+    """Load the sv_ttk theme once the window is up; it is the slowest startup step"""
+    import sv_ttk
+    sv_ttk.set_theme("dark")
+    profile.mark("apply theme")
+    profile.report()
 
 
 def main():
+    if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+        # Headless command-line mode; no window is created
+        import easyini.cli
+        if sys.argv[1] in easyini.cli.COMMANDS:
+            sys.exit(easyini.cli.main(sys.argv[1:]))
+    profile = StartupProfile(enabled="--startup-profile" in sys.argv)
+    profile.mark("imports")
     root = tk.Tk()
-    sv_ttk.set_theme("dark") 
-    app = Editor(root)
+    profile.mark("create root window")
+    app = Editor(root, profile)
+
+    def _on_first_map(event):
+        if event.widget is root and not profile.first_window_ms:
+            profile.first_window_ms = (time.perf_counter() - _STARTED) * 1000
+            root.after_idle(apply_theme, root, profile)
+
+    root.bind("<Map>", _on_first_map, add="+")
     root.mainloop()
 
 
 if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        # Lets the bulk-apply process pool start workers from the frozen exe
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import os
+
+from easyini.cache import ParseCache
+
+
+def _write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hit_serves_the_cached_parse(tmp_path):
+    path = tmp_path / "a.ini"
+    _write(path, "[A]\nk = 1\n")
+    cache = ParseCache(mode="eager")
+    cache.get(str(path))
+    document, config = cache.get(str(path))
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert config["A"]["k"] == "1"
+    assert document.get("A", "k") == "1"
+
+
+def test_edits_of_one_caller_stay_private(tmp_path):
+    path = tmp_path / "a.ini"
+    _write(path, "[A]\nk = 1\n")
+    cache = ParseCache(mode="eager")
+    document, config = cache.get(str(path))
+    config["A"]["k"] = "2"
+    config.add_section("B")
+    document.set("A", "k", "2")
+    other_document, other_config = cache.get(str(path))
+    assert other_config["A"]["k"] == "1"
+    assert not other_config.has_section("B")
+    assert other_document.get("A", "k") == "1"
+    assert config["A"]["k"] == "2"
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    path = tmp_path / "a.ini"
+    _write(path, "[A]\nk = 1\n", 1_000_000_000)
+    cache = ParseCache(mode="eager")
+    cache.get(str(path))
+    # Same size, only the modification time tells the versions apart
+    _write(path, "[A]\nk = 2\n", 2_000_000_000)
+    _document, config = cache.get(str(path))
+    assert config["A"]["k"] == "2"
+    assert cache.stats()["misses"] == 2
+
+
+def test_invalidate_and_revalidate(tmp_path):
+    path = tmp_path / "a.ini"
+    _write(path, "[A]\nk = 1\n")
+    cache = ParseCache(mode="eager")
+    cache.get(str(path))
+    assert cache.is_fresh(str(path))
+    cache.invalidate(str(path))
+    assert cache.stats()["entries"] == 0
+
+    cache.get(str(path))
+    _write(path, "[A]\nk = 22\n")
+    cache.revalidate(str(path))
+    assert cache.stats()["entries"] == 0
+    assert cache.is_fresh(str(path))
+    _write(path, "[A]\nk = 333\n")
+    assert not cache.is_fresh(str(path))
+
+
+def test_lazy_entries_hand_out_independent_views(tmp_path):
+    path = tmp_path / "a.ini"
+    _write(path, "[A]\nk = 1\n")
+    cache = ParseCache(mode="lazy")
+    _document, view = cache.get(str(path))
+    view["A"]["k"] = "2"
+    _document, other = cache.get(str(path))
+    assert other["A"]["k"] == "1"
+    assert cache.stats()["hits"] == 1
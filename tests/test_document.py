@@ -0,0 +1,95 @@
+import pytest
+
+from easyini.document import FileChangedError, IniDocument, content_digest
+from easyini.storage import commit_patches
+
+SAMPLE = (
+    "﻿[server]\r\n"
+    "; keep this comment\r\n"
+    "host = example.org   \r\n"
+    "ports = 80\r\n"
+    "\t443\r\n"
+    "\r\n"
+    "[client]\r\n"
+    "retries: 3\r\n"
+).encode('utf-8')
+
+
+@pytest.fixture
+def ini(tmp_path):
+    path = tmp_path / "sample.ini"
+    path.write_bytes(SAMPLE)
+    return path
+
+
+def test_unchanged_document_round_trips():
+    document = IniDocument(SAMPLE)
+    assert document.to_bytes() == SAMPLE
+    assert document.get("server", "ports") == "80\n443"
+    assert document.get("client", "retries") == "3"
+    assert document.get("client", "missing") is None
+
+
+def test_set_touches_only_the_edited_value(ini):
+    document = IniDocument.load(ini)
+    document.set("server", "host", "example.com")
+    assert commit_patches({str(ini): [document.prepare_write()]}) is None
+    assert ini.read_bytes() == SAMPLE.replace(b"example.org", b"example.com")
+
+
+def test_chained_patches_match_the_document(ini):
+    document = IniDocument.load(ini)
+    patches = []
+    document.set("server", "ports", "8080")
+    patches.append(document.prepare_write())
+    document.set("client", "timeout", "5")
+    document.remove("server", "host")
+    patches.append(document.prepare_write())
+    document.set("new", "key", "a\nb")
+    patches.append(document.prepare_write())
+    assert commit_patches({str(ini): patches}) is None
+    data = ini.read_bytes()
+    assert data == document.to_bytes()
+    assert document.synced_digest() == content_digest(data)
+    reread = IniDocument(data)
+    assert reread.get("server", "ports") == "8080"
+    assert reread.get("server", "host") is None
+    assert reread.get("client", "timeout") == "5"
+    assert reread.get("new", "key") == "a\nb"
+    assert data.startswith(b"\xef\xbb\xbf") and b"; keep this comment\r\n" in data
+
+
+def test_patches_apply_in_place(ini):
+    document = IniDocument.load(ini)
+    document.set("server", "host", "localhost")
+    first = document.prepare_write()
+    document.set("client", "retries", "10")
+    second = document.prepare_write()
+    first.apply(str(ini))
+    second.apply(str(ini))
+    assert ini.read_bytes() == document.to_bytes()
+
+
+def test_rollback_rewrites_the_whole_file_next_time(ini):
+    document = IniDocument.load(ini)
+    document.set("server", "host", "one")
+    patch = document.prepare_write()
+    ini.write_bytes(SAMPLE + b"extra = 1\r\n")
+    assert isinstance(commit_patches({str(ini): [patch]}), FileChangedError)
+    document.rollback(patch)
+    ini.write_bytes(SAMPLE)
+    document.set("server", "host", "two")
+    assert commit_patches({str(ini): [document.prepare_write()]}) is None
+    assert ini.read_bytes() == document.to_bytes()
+    assert IniDocument(ini.read_bytes()).get("server", "host") == "two"
+
+
+def test_copies_do_not_share_edits():
+    document = IniDocument(SAMPLE)
+    copy = document.copy()
+    copy.set("server", "host", "changed")
+    copy.set("added", "key", "1")
+    assert document.get("server", "host") == "example.org"
+    assert document.get("added", "key") is None
+    assert document.to_bytes() == SAMPLE
+    assert copy.get("server", "host") == "changed"
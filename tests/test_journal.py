@@ -0,0 +1,74 @@
+import json
+
+from easyini.cache import ParseCache
+from easyini.journal import EditJournal, replay_pending
+
+
+def _entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_checkpoint_truncates_once_everything_is_applied(tmp_path):
+    journal = EditJournal(str(tmp_path / "journal.jsonl"))
+    first = journal.append("a.ini", "A", "k", "1")
+    second = journal.append("b.ini", "B", "k", "2")
+    journal.sync()
+    assert [entry["seq"] for entry in journal.pending()] == [first, second]
+
+    journal.checkpoint("a.ini", first)
+    journal.sync()
+    assert [entry["path"] for entry in journal.pending()] == ["b.ini"]
+    assert journal.last_seq("a.ini") is None and journal.last_seq("b.ini") == second
+
+    journal.checkpoint("b.ini", second)
+    journal.sync()
+    assert journal.pending() == []
+    assert (tmp_path / "journal.jsonl").read_bytes() == b""
+    journal.close()
+    assert not (tmp_path / "journal.jsonl").exists()
+
+
+def test_unapplied_edits_survive_close(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = EditJournal(str(path))
+    journal.append("a.ini", "A", "k", "1")
+    journal.close()
+    reopened = EditJournal.claim(str(path))
+    assert [entry["value"] for entry in reopened.pending()] == ["1"]
+    reopened.close()
+
+
+def test_replay_applies_pending_edits(tmp_path):
+    ini = tmp_path / "a.ini"
+    ini.write_text("[A]\nk = 1\ngone = x\n")
+    journal = EditJournal(str(tmp_path / "journal.jsonl"))
+    journal.append(str(ini), "A", "k", "first")
+    journal.sync()
+    journal.append(str(ini), "A", "k", "2")
+    journal.append(str(ini), "A", "gone", None)
+    journal.append(str(ini), "B", "new", "3")
+    journal.sync()
+
+    count, errors = replay_pending(journal, ParseCache(mode="eager"))
+    assert (count, errors) == (4, [])
+    assert ini.read_text() == "[A]\nk = 2\n\n[B]\nnew = 3\n"
+    assert journal.pending() == []
+    journal.close()
+
+
+def test_failed_replay_keeps_its_edits(tmp_path):
+    ini = tmp_path / "a.ini"
+    ini.write_text("[A]\nk = 1\n")
+    missing = tmp_path / "missing.ini"
+    path = tmp_path / "journal.jsonl"
+    journal = EditJournal(str(path))
+    journal.append(str(missing), "A", "k", "lost")
+    journal.append(str(ini), "A", "k", "2")
+    journal.sync()
+
+    count, errors = replay_pending(journal, ParseCache(mode="eager"))
+    assert count == 1 and len(errors) == 1
+    assert ini.read_text() == "[A]\nk = 2\n"
+    assert [entry["path"] for entry in journal.pending()] == [str(missing)]
+    assert [entry["value"] for entry in _entries(path)] == ["lost"]
+    journal.close()
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from easyini.cache import ParseCache
+from easyini.prefetch import Prefetcher
+
+FIELDS = [{"section": "A", "option": "k"}]
+
+
+def _wait(prefetcher):
+    for future in list(prefetcher._futures):
+        future.result()
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name in ("a.ini", "b.ini"):
+        path = tmp_path / name
+        path.write_text(f"[A]\nk = {name}\n")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def prefetcher():
+    prefetcher = Prefetcher(ParseCache(mode="eager"), workers=2)
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+def _configs(paths):
+    return [{"name": os.path.basename(path), "path": path, "fields": FIELDS} for path in paths]
+
+
+def test_prefetched_model_is_handed_out_once(files, prefetcher):
+    prefetcher.prefetch(_configs(files))
+    _wait(prefetcher)
+    prefetcher.activate(files[0])
+    model = prefetcher.view_model(files[0], FIELDS)
+    assert model is not None and model["config"]["A"]["k"] == "a.ini"
+    assert files[0] not in [name for name in prefetcher._models]
+    again = prefetcher.view_model(files[0], FIELDS)
+    assert again is not model
+    assert again["config"]["A"]["k"] == "a.ini"
+
+
+def test_activate_keeps_the_model_of_the_opened_file(files, prefetcher):
+    prefetcher.prefetch(_configs(files))
+    _wait(prefetcher)
+    name = ParseCache._normalize(files[0])
+    assert name in prefetcher._models
+    prefetcher.activate(files[0])
+    assert name in prefetcher._models
+    model = prefetcher._models[name][1]
+    assert prefetcher.view_model(files[0], FIELDS) is model
+
+
+def test_activate_rewarms_the_previous_file(files, prefetcher):
+    prefetcher.prefetch(_configs(files))
+    _wait(prefetcher)
+    prefetcher.activate(files[0])
+    prefetcher.view_model(files[0], FIELDS)
+    prefetcher.activate(files[1])
+    _wait(prefetcher)
+    assert ParseCache._normalize(files[0]) in prefetcher._models
+
+
+def test_stale_or_mismatched_models_are_rebuilt(files, prefetcher):
+    prefetcher.prefetch(_configs(files))
+    _wait(prefetcher)
+    with open(files[0], 'w') as f:
+        f.write("[A]\nk = changed on disk\n")
+    assert prefetcher.view_model(files[0], FIELDS)["config"]["A"]["k"] == "changed on disk"
+
+    other_fields = [{"section": "A", "option": "other"}]
+    model = prefetcher.view_model(files[1], other_fields)
+    assert [spec.key for spec in model["specs"]] == [("A", "other")]
+
+
+def test_models_keep_their_own_copies(files, prefetcher):
+    first = prefetcher.view_model(files[0], FIELDS)
+    first["config"]["A"]["k"] = "edited"
+    first["document"].set("A", "k", "edited")
+    second = prefetcher.view_model(files[0], FIELDS)
+    assert second["config"]["A"]["k"] == "a.ini"
+    assert second["document"].get("A", "k") == "a.ini"
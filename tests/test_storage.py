@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import easyini.storage as storage
+from easyini.document import FileChangedError, IniDocument
+from easyini.storage import commit_patches
+
+
+@pytest.fixture
+def ini(tmp_path):
+    path = tmp_path / "a.ini"
+    path.write_text("[A]\nk = 1\n")
+    return path
+
+
+def _edited(path, value):
+    document = IniDocument.load(path)
+    document.set("A", "k", value)
+    return document.prepare_write()
+
+
+def test_commit_reports_written_paths(ini):
+    written = []
+    assert commit_patches({str(ini): [_edited(ini, "2")]}, written.append) is None
+    assert written == [str(ini)]
+    assert ini.read_text() == "[A]\nk = 2\n"
+    assert os.listdir(ini.parent) == ["a.ini"]
+
+
+@pytest.mark.parametrize("other", ["[A]\nk = 1\nx = 1\n", "[A]\nk = 7\n"])
+def test_changes_before_commit_are_detected(ini, other):
+    patch = _edited(ini, "2")
+    ini.write_text(other)
+    written = []
+    assert isinstance(commit_patches({str(ini): [patch]}, written.append), FileChangedError)
+    assert written == []
+    assert ini.read_text() == other
+    assert os.listdir(ini.parent) == ["a.ini"]
+
+
+def test_changes_while_staging_are_detected(ini, monkeypatch):
+    patch = _edited(ini, "2")
+    stage_file = storage.stage_file
+
+    def stage_racing_another_writer(path, data):
+        staged = stage_file(path, data)
+        # Same size as the content that was checked, but written later
+        ini.write_text("[A]\nk = 9\n")
+        st = os.stat(ini)
+        os.utime(ini, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        return staged
+
+    monkeypatch.setattr(storage, "stage_file", stage_racing_another_writer)
+    assert isinstance(commit_patches({str(ini): [patch]}), FileChangedError)
+    assert ini.read_text() == "[A]\nk = 9\n"
+    assert os.listdir(ini.parent) == ["a.ini"]
+
+
+def test_one_failed_file_does_not_stop_the_group(ini, tmp_path):
+    other = tmp_path / "b.ini"
+    other.write_text("[A]\nk = 1\n")
+    failing = _edited(ini, "2")
+    ini.write_text("[A]\nk = 3\n")
+    error = commit_patches({str(ini): [failing], str(other): [_edited(other, "4")]})
+    assert isinstance(error, FileChangedError)
+    assert other.read_text() == "[A]\nk = 4\n"